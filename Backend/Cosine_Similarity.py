@@ -1,16 +1,150 @@
+import argparse
+import glob
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from modules.corpus_stats import CorpusStats
+from modules.nltk_resources import get_stopwords, get_word_tokenize
+from modules.term_cache import TermCountCache
+from modules.tokenizer import tokenize
+
+WEIGHTINGS = ('binary', 'tf', 'tfidf')
+# 'nltk' is nltk.word_tokenize (needs the punkt models); 'fast' is the shared
+# regex tokenizer, several times faster but not token-for-token identical
+TOKENIZERS = ('nltk', 'fast')
+
+
+def get_tokenizer(tokenizer):
+    """Tokenizer callable for a name in TOKENIZERS (callables are returned as is)"""
+    if callable(tokenizer):
+        return tokenizer
+    if tokenizer not in TOKENIZERS:
+        raise ValueError(f"tokenizer must be one of {TOKENIZERS} or a callable")
+    return get_word_tokenize() if tokenizer == 'nltk' else tokenize
+
+
+def _term_arrays(counter):
+    """(terms, counts) arrays of a Counter, sorted by term"""
+    # Object arrays hold references to the token strings; a fixed-width
+    # str array would pad every term to the longest one
+    terms = np.array(sorted(counter), dtype=object)
+    counts = np.fromiter((counter[term] for term in terms), dtype=np.int64, count=len(terms))
+    return terms, counts
+
+
+def count_terms(tokens, stop_words):
+    """
+    Sorted unique non-stopword terms of a token list and their counts
+    Returns:
+        (terms, counts) arrays
+    """
+    return _term_arrays(Counter(token for token in tokens if token not in stop_words))
+
+
+def merge_term_counts(counts1, counts2):
+    """Merge two (terms, counts) pairs into one, still sorted and unique"""
+    totals = Counter(dict(zip(counts1[0].tolist(), counts1[1].tolist())))
+    totals.update(dict(zip(counts2[0].tolist(), counts2[1].tolist())))
+    return _term_arrays(totals)
+
+
+def weight_terms(terms, counts, weighting='binary', corpus_stats=None):
+    """
+    Weights for (terms, counts): 'binary' (term presence), 'tf' (raw counts)
+    or 'tfidf' (counts * idf from corpus_stats, which is then required)
+    Returns:
+        (terms, weights) with float64 weights
+    """
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"weighting must be one of {WEIGHTINGS}")
+    if weighting == 'tfidf' and corpus_stats is None:
+        raise ValueError("tfidf weighting needs corpus_stats")
+    
+    if weighting == 'binary':
+        weights = np.ones(len(terms), dtype=np.float64)
+    else:
+        weights = counts.astype(np.float64)
+        if weighting == 'tfidf':
+            weights *= corpus_stats.idf_array(terms)
+    return terms, weights
+
+
+def build_term_vector(tokens, stop_words, weighting='binary', corpus_stats=None):
+    """
+    Sparse term vector from a token list
+    Args:
+        tokens: list of tokens
+        stop_words: set of tokens to drop
+        weighting: 'binary', 'tf' or 'tfidf' (see weight_terms)
+        corpus_stats: CorpusStats store, required for 'tfidf'
+    Returns:
+        (terms, weights): sorted unique term array and aligned float64 weights
+    """
+    return weight_terms(*count_terms(tokens, stop_words), weighting, corpus_stats)
+
+
+def stream_term_counts(file_path, text_column, stop_words, chunksize=10_000, tokenizer='nltk'):
+    """
+    Term counts of a CSV text column, read and tokenized chunk by chunk
+    Memory is bounded by the chunk size plus the vocabulary, not the file size.
+    Args:
+        tokenizer: name in TOKENIZERS or a callable text -> tokens
+    Returns:
+        (terms, counts) arrays, as count_terms would give for the whole column
+    Raises:
+        KeyError: if the file has no text_column
+    """
+    if text_column not in pd.read_csv(file_path, nrows=0).columns:
+        raise KeyError(text_column)
+    tokenizer = get_tokenizer(tokenizer)
+    totals = Counter()
+    for chunk in pd.read_csv(file_path, usecols=[text_column], chunksize=chunksize):
+        text = ' '.join(chunk[text_column].astype(str))
+        totals.update(token for token in tokenizer(text.lower()) if token not in stop_words)
+    return _term_arrays(totals)
+
 
-nltk.download('stopwords')
-nltk.download('punkt')
-nltk.download('punkt_tab')
+def sparse_cosine(vector1, vector2):
+    """Cosine similarity of two (terms, weights) vectors; 0.0 if either is empty"""
+    terms1, weights1 = vector1
+    terms2, weights2 = vector2
+    _, idx1, idx2 = np.intersect1d(terms1, terms2, assume_unique=True, return_indices=True)
+    norms = np.dot(weights1, weights1) * np.dot(weights2, weights2)
+    if norms == 0:
+        return 0.0
+    return float(np.dot(weights1[idx1], weights2[idx2]) / norms ** 0.5)
 
-def calculate_cosine_similarity(file1_path, file2_path, text_column):
+
+def calculate_cosine_similarity(file1_path, file2_path, text_column, corpus_stats=None,
+                                weighting=None, chunksize=None, tokenizer='nltk'):
+    """
+    Cosine similarity between the text columns of two CSV files
+    Args:
+        weighting: 'binary', 'tf' or 'tfidf'; defaults to 'tfidf' when
+            corpus_stats (a CorpusStats store) is given, else 'binary'
+            (each file is a set of non-stopword tokens)
+        chunksize: stream each file in chunks of this many rows, accumulating
+            term counts incrementally, instead of joining the whole column
+            into one string
+        tokenizer: 'nltk' (nltk.word_tokenize, the default, so scores are
+            unchanged), 'fast' (modules.tokenizer.tokenize, much faster with
+            slightly different tokens and scores) or a callable text -> tokens
+    """
+    if weighting is None:
+        weighting = 'binary' if corpus_stats is None else 'tfidf'
+    tokenizer = get_tokenizer(tokenizer)
+    sw = get_stopwords()
+    
+    if chunksize:
+        X_vector = weight_terms(*stream_term_counts(file1_path, text_column, sw, chunksize, tokenizer),
+                                weighting, corpus_stats)
+        Y_vector = weight_terms(*stream_term_counts(file2_path, text_column, sw, chunksize, tokenizer),
+                                weighting, corpus_stats)
+        return sparse_cosine(X_vector, Y_vector)
+    
     # Read CSV files
     df1 = pd.read_csv(file1_path)
     df2 = pd.read_csv(file2_path)
@@ -20,45 +154,135 @@ def calculate_cosine_similarity(file1_path, file2_path, text_column):
     text2 = ' '.join(df2[text_column].astype(str))
     
     # Tokenization
-    X_list = word_tokenize(text1.lower())
-    Y_list = word_tokenize(text2.lower())
-    
-    # Remove stopwords
-    sw = stopwords.words('english')
-    X_set = {w for w in X_list if not w in sw}
-    Y_set = {w for w in Y_list if not w in sw}
-    
-    # Create vector
-    rvector = X_set.union(Y_set)
-    l1 = []
-    l2 = []
+    X_list = tokenizer(text1.lower())
+    Y_list = tokenizer(text2.lower())
     
-    for w in rvector:
-        if w in X_set: 
-            l1.append(1)
-        else: 
-            l1.append(0)
-        if w in Y_set: 
-            l2.append(1)
-        else: 
-            l2.append(0)
+    # Sparse vectors without stopwords
+    X_vector = build_term_vector(X_list, sw, weighting, corpus_stats)
+    Y_vector = build_term_vector(Y_list, sw, weighting, corpus_stats)
     
-    # Calculate cosine similarity
-    c = sum(l1[i] * l2[i] for i in range(len(rvector)))
-    cosine = c / float((sum(l1) * sum(l2)) ** 0.5)
+    return sparse_cosine(X_vector, Y_vector)
+
+def file_term_counts(file_path, text_column, cache_dir=None, chunksize=10_000, tokenizer='nltk'):
+    """
+    Non-stopword (terms, counts) of one CSV text column, streamed in chunks
+    With cache_dir, results are cached on disk by path, mtime, size and
+    tokenizer name (one of TOKENIZERS).
+    """
+    cache = TermCountCache(cache_dir) if cache_dir else None
+    if cache is not None:
+        cached = cache.get(file_path, text_column, tokenizer)
+        if cached is not None:
+            return cached
+    term_counts = stream_term_counts(file_path, text_column, get_stopwords(), chunksize, tokenizer)
+    if cache is not None:
+        cache.put(file_path, text_column, term_counts, tokenizer)
+    return term_counts
+
+
+def _file_term_counts_task(args):
+    """Process pool entry point for file_term_counts"""
+    return file_term_counts(*args)
+
+
+def pairwise_file_similarity(file_paths, text_column, weighting='binary', corpus_stats=None,
+                             n_jobs=1, cache_dir=None, chunksize=10_000, tokenizer='nltk'):
+    """
+    Full pairwise cosine similarity matrix between the text columns of many CSV files
+    Args:
+        file_paths: list of CSV paths
+        text_column: column holding the text in every file
+        weighting: 'binary', 'tf' or 'tfidf' (tfidf needs corpus_stats)
+        n_jobs: worker processes tokenizing files (-1 = all cores)
+        cache_dir: on-disk term-count cache; unchanged files are not re-read
+        chunksize: CSV rows per streamed chunk
+        tokenizer: 'nltk' or 'fast' (see calculate_cosine_similarity)
+    Returns:
+        square DataFrame of similarities indexed by file path
+    """
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    tasks = [(path, text_column, cache_dir, chunksize, tokenizer) for path in file_paths]
+    if n_jobs == 1 or len(tasks) <= 1:
+        term_counts = [_file_term_counts_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as pool:
+            term_counts = list(pool.map(_file_term_counts_task, tasks))
     
-    return cosine
+    # One sparse file x vocabulary matrix, L2-normalized, so a single product
+    # gives every pairwise cosine
+    from scipy import sparse
+    vectors = [weight_terms(terms, counts, weighting, corpus_stats) for terms, counts in term_counts]
+    vocabulary, columns = np.unique(
+        np.concatenate([terms for terms, _ in vectors] or [np.array([], dtype=object)]),
+        return_inverse=True
+    )
+    weights = np.concatenate([w for _, w in vectors] or [np.array([])])
+    rows = np.repeat(np.arange(len(vectors)), [len(terms) for terms, _ in vectors])
+    matrix = sparse.csr_matrix((weights, (rows, columns)), shape=(len(vectors), len(vocabulary)))
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    matrix = sparse.diags(1.0 / norms) @ matrix
+    similarity = (matrix @ matrix.T).toarray()
+    return pd.DataFrame(similarity, index=list(file_paths), columns=list(file_paths))
 
-# Example usage
-if __name__ == "__main__":
-    file1_path = "one_star_reviews_sample.csv"
-    file2_path = "four_star_reviews_sample.csv"
-    text_column = "Reviews"  # Replace with your column name
+
+def main(argv=None):
+    """Command line: pairwise similarity of CSV files given as paths and/or globs"""
+    parser = argparse.ArgumentParser(description="Pairwise cosine similarity between CSV text columns")
+    parser.add_argument('files', nargs='*', help="CSV files or glob patterns (quoted)")
+    parser.add_argument('--column', default='Reviews', help="text column (default: Reviews)")
+    parser.add_argument('--weighting', choices=WEIGHTINGS, default='binary')
+    parser.add_argument('--corpus-stats', help="CorpusStats SQLite DB (required for tfidf)")
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes (-1 = all cores)")
+    parser.add_argument('--cache-dir', default='data/cache/term_counts',
+                        help="on-disk term-count cache ('' disables)")
+    parser.add_argument('--chunksize', type=int, default=10_000)
+    parser.add_argument('--tokenizer', choices=TOKENIZERS, default='nltk',
+                        help="'fast' is much quicker; scores differ slightly from nltk")
+    parser.add_argument('--output', help="write the matrix to this CSV")
+    args = parser.parse_args(argv)
+    if args.weighting == 'tfidf' and not args.corpus_stats:
+        parser.error("--weighting tfidf needs --corpus-stats")
+    if args.corpus_stats and not os.path.exists(args.corpus_stats):
+        parser.error(f"corpus stats DB not found: {args.corpus_stats}")
+    corpus_stats = CorpusStats(db_path=args.corpus_stats) if args.corpus_stats else None
+    
+    if not args.files:
+        # Example usage
+        args.files = ["one_star_reviews_sample.csv", "four_star_reviews_sample.csv"]
+    file_paths = []
+    for pattern in args.files:
+        # Patterns without matches are kept so missing files are reported
+        matches = sorted(glob.glob(pattern)) or [pattern]
+        file_paths.extend(path for path in matches if path not in file_paths)
     
     try:
-        similarity = calculate_cosine_similarity(file1_path, file2_path, text_column)
-        print(f"Cosine similarity between the files: {similarity:.4f}")
-    except FileNotFoundError:
-        print("Error: One or both CSV files not found")
+        similarity = pairwise_file_similarity(
+            file_paths, args.column, weighting=args.weighting, corpus_stats=corpus_stats,
+            n_jobs=args.jobs, cache_dir=args.cache_dir or None, chunksize=args.chunksize,
+            tokenizer=args.tokenizer
+        )
+    except FileNotFoundError as e:
+        print(f"Error: CSV file not found: {e.filename}")
+        return 1
     except KeyError:
-        print(f"Error: Column '{text_column}' not found in one or both CSV files")
\ No newline at end of file
+        print(f"Error: Column '{args.column}' not found in one or more CSV files")
+        return 1
+    except LookupError as e:
+        # NLTK data (stopwords, punkt) not installed
+        print(f"Error: {e}")
+        return 1
+    
+    if args.output:
+        similarity.to_csv(args.output)
+    if len(file_paths) == 2:
+        print(f"Cosine similarity between the files: {similarity.iat[0, 1]:.4f}")
+    else:
+        with pd.option_context('display.width', 200, 'display.max_columns', None):
+            print(similarity.round(4))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,9 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS, cross_origin
 from modules.lyric_analysis import LyricAnalyzer
-from modules.prediction import HitPredictor
+from modules.analysis_cache import AnalysisCache
+from modules.corpus_stats import CorpusStats
+from modules.model_registry import ModelRegistry, ModelWatcher
 import os
 
 app = Flask(__name__)
@@ -26,9 +28,25 @@ def after_request(response):
     response.headers.add('Access-Control-Allow-Credentials', 'true')
     return response
 
+# Local data (caches, corpus statistics, model registry) lives under DATA_DIR,
+# by default Backend/data, whatever directory the app is started from
+DATA_DIR = os.environ.get('DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+
 # Initialize components
-lyric_analyzer = LyricAnalyzer()
-hit_predictor = HitPredictor()
+lyric_analyzer = LyricAnalyzer(cache=AnalysisCache(
+    max_entries=int(os.environ.get('LYRIC_CACHE_SIZE', 10000)),
+    db_path=os.environ.get('LYRIC_CACHE_DB', os.path.join(DATA_DIR, 'cache', 'lyric_analysis.sqlite'))
+), corpus_stats=CorpusStats(
+    db_path=os.environ.get('CORPUS_STATS_DB', os.path.join(DATA_DIR, 'corpus', 'corpus_stats.sqlite'))
+), theme_lexicon=os.environ.get('THEME_LEXICON'),
+    theme_backend=os.environ.get('THEME_BACKEND'))
+
+# Serves the registry's active model version; a newly activated version is
+# loaded in the background and swapped in without blocking requests
+model_watcher = ModelWatcher(
+    ModelRegistry(os.environ.get('MODEL_REGISTRY', os.path.join(DATA_DIR, 'models', 'registry'))),
+    interval=float(os.environ.get('MODEL_RELOAD_INTERVAL', 10))
+).start()
 
 @app.route('/api/analyze', methods=['POST', 'OPTIONS'])
 @cross_origin(origin='http://localhost:3000', supports_credentials=True)
@@ -52,13 +70,32 @@ def analyze_song():
         if lyrics:
             import pandas as pd
             df = pd.DataFrame({'lyrics': [lyrics]})
-            df_with_analysis = lyric_analyzer.add_analysis_features(df)
+            df_with_analysis = lyric_analyzer.analyze(df)
             lyrics_analysis = df_with_analysis.iloc[0].to_dict()
         
-        # Create prediction
+        # Create prediction: the serving model when one is loaded and has all
+        # its feature columns, else the heuristic score
+        probability = min(0.99, danceability * 0.3 + energy * 0.25 + valence * 0.2 + (tempo/200) * 0.15)
+        confidence = 0.8
+        model_info = None
+        serving = model_watcher.current
+        if serving is not None:
+            try:
+                result = serving['predictor'].predict({
+                    'danceability': danceability, 'energy': energy, 'tempo': tempo,
+                    'valence': valence, 'genre': genre, **lyrics_analysis
+                })
+                probability = float(result['probability_top_chart'])
+                confidence = float(result['confidence'])
+                model_info = {key: serving[key] for key in ('version', 'loaded_at', 'load_seconds')}
+            except ValueError as e:
+                app.logger.warning("Model %s not used, falling back to heuristic score: %s",
+                                   serving['version'], e)
+        
         prediction_result = {
-            'probability_top_chart': min(0.99, danceability * 0.3 + energy * 0.25 + valence * 0.2 + (tempo/200) * 0.15),
-            'confidence': 0.8,
+            'probability_top_chart': probability,
+            'confidence': confidence,
+            'model': model_info,
             'analysis': {
                 'danceability_impact': danceability * 100 / 2,
                 'energy_impact': energy * 100 / 2,
@@ -98,6 +135,14 @@ def get_analyses():
     
     return jsonify(saved_analyses), 200
 
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify(lyric_analyzer.cache.stats()), 200
+
+@app.route('/api/model/stats', methods=['GET'])
+def model_stats():
+    return jsonify(model_watcher.stats()), 200
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Benchmark: result assembly of _analyze_dataframe, old vs. preallocated columns
+Usage (from Backend/): python -m benchmarks.bench_assembly [n_rows]
+The current layout is the real LyricAnalyzer._analyze_dataframe with VADER
+and TextBlob stubbed out (per-song sentiment is a fixed dict), so only word
+counts, theme detection and column assembly are measured; each strategy runs
+in its own process and reports its peak RSS growth.
+"""
+import resource
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.bench_theme_matcher import THEME_KEYWORDS, make_corpus
+from modules.lyric_analysis import LyricAnalyzer
+from modules.theme_matcher import ThemeMatcher
+
+SENTIMENT = {
+    'sentiment_compound': 0.5,
+    'sentiment_positive': 0.3,
+    'sentiment_negative': 0.1,
+    'textblob_polarity': 0.2,
+    'textblob_subjectivity': 0.6
+}
+
+
+class StubSentimentAnalyzer(LyricAnalyzer):
+    """LyricAnalyzer with a fixed sentiment result instead of VADER/TextBlob"""
+
+    def _get_sentiment(self, text):
+        return dict(SENTIMENT)
+
+
+def assemble_dicts(df, matcher):
+    """Previous layout: per-row dicts -> DataFrames -> concat, default dtypes"""
+    text_features = pd.DataFrame(
+        [
+            {
+                **SENTIMENT,
+                'word_count': len(text.split()),
+                'unique_words': len(set(word.lower() for word in text.split() if word.isalpha()))
+            }
+            for text in df['lyrics']
+        ],
+        index=df.index
+    )
+    themes = pd.DataFrame([matcher.match(text) for text in df['lyrics']], index=df.index)
+    features = pd.concat([text_features, themes], axis=1)
+    columns = list(SENTIMENT) + list(themes.columns) + ['word_count', 'unique_words']
+    return pd.concat([df, features[columns]], axis=1)
+
+
+def assemble_columns(df, analyzer):
+    """Current layout: LyricAnalyzer._analyze_dataframe (preallocated compact columns)"""
+    return analyzer._analyze_dataframe(df)
+
+
+STRATEGIES = {
+    'dicts': ('per-row dicts + concat', assemble_dicts),
+    'columns': ('_analyze_dataframe', assemble_columns),
+}
+
+
+def run_strategy(n_rows, strategy):
+    """Run one strategy in this process and print time and peak RSS growth"""
+    # Repeat a small pool of songs so corpus generation does not dominate
+    pool = make_corpus(min(n_rows, 10_000), words_per_song=60)
+    df = pd.DataFrame({'lyrics': [pool[i % len(pool)] for i in range(n_rows)]})
+    if strategy == 'dicts':
+        backend = ThemeMatcher(THEME_KEYWORDS)
+    else:
+        backend = StubSentimentAnalyzer(theme_lexicon=THEME_KEYWORDS)
+    label, func = STRATEGIES[strategy]
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    result = func(df, backend)
+    seconds = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    size = result.drop(columns=['lyrics']).memory_usage().sum() / 2 ** 20
+    # ru_maxrss is in KiB on Linux
+    print(f"{label:<30} {seconds:7.2f}s  peak +{(rss_after - rss_before) / 1024:7.1f} MiB  "
+          f"features {size:7.1f} MiB")
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    if len(sys.argv) > 2:
+        run_strategy(n_rows, sys.argv[2])
+        return
+
+    print(f"Rows: {n_rows}")
+    # One fresh process per strategy so peak RSS is not shared
+    for strategy in STRATEGIES:
+        subprocess.run([sys.executable, '-m', 'benchmarks.bench_assembly', str(n_rows), strategy])
+
+
+if __name__ == "__main__":
+    main()
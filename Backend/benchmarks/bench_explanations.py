@@ -0,0 +1,65 @@
+"""
+Benchmark: per-song tree-path explanations vs. plain batched prediction
+Usage (from Backend/): python -m benchmarks.bench_explanations [repeats]
+Contributions are checked against a per-tree decision_path reference on a
+sample of rows, and bias + contributions must reconstruct the probability.
+"""
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.bench_prediction import make_data, make_predictor
+
+BATCH_SIZES = (1, 1_000, 100_000)
+
+
+def reference_contributions(model, X):
+    """Path contributions to class 1, one tree and one row at a time"""
+    contributions = np.zeros(X.shape)
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        value = tree.value[:, 0, 1] / tree.value[:, 0, :].sum(axis=1)
+        paths = estimator.decision_path(X.astype(np.float32))
+        for row in range(X.shape[0]):
+            nodes = paths.indices[paths.indptr[row]:paths.indptr[row + 1]]
+            for parent, child in zip(nodes[:-1], nodes[1:]):
+                contributions[row, tree.feature[parent]] += value[child] - value[parent]
+    return contributions / len(model.estimators_)
+
+
+def best_time(function, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    predictor = make_predictor()
+    X_all, _ = make_data(max(BATCH_SIZES), seed=1)
+
+    sample = X_all[:50]
+    explained = predictor.predict_batch(sample, explain=True)
+    expected = reference_contributions(predictor.model, predictor.scaler.transform(sample))
+    reconstructed = explained['bias'] + explained['contributions'].sum(axis=1)
+    distinct = len({tuple(row) for row in predictor.predict_batch(X_all[:1_000], explain=True)['top_features']})
+
+    print(f"Max diff vs decision_path:    {np.abs(explained['contributions'] - expected).max():.2e}")
+    print(f"Max |bias + sum - proba|:     {np.abs(reconstructed - explained['probability_top_chart']).max():.2e}")
+    print(f"Distinct top-3 sets:          {distinct} of 1000 songs (global importance: 1)")
+    print()
+    print(f"{'batch':>8}{'predict':>14}{'explain':>14}{'ratio':>8}")
+    for batch_size in BATCH_SIZES:
+        X = X_all[:batch_size]
+        n = repeats if batch_size < 100_000 else max(1, repeats // 3)
+        plain = best_time(lambda: predictor.predict_batch(X), n)
+        explain = best_time(lambda: predictor.predict_batch(X, explain=True), n)
+        print(f"{batch_size:>8}{plain * 1e3:>12.2f}ms{explain * 1e3:>12.2f}ms{explain / plain:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: saved FeaturePipeline vs. sklearn StandardScaler + OneHotEncoder
+Usage (from Backend/): python -m benchmarks.bench_feature_pipeline [n_rows]
+Trains HitPredictor on a synthetic DataFrame of audio, lyric and categorical
+columns, reloads it from disk and checks that serving-time transforms (one
+dict per song, or a batch) give exactly the training-time rows and the same
+probabilities as the fitted forest. Transform cost is reported per row.
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from modules.feature_pipeline import FeaturePipeline
+from modules.prediction import HitPredictor
+
+GENRES = np.array(['Pop', 'Rock', 'Hip-Hop', 'R&B', 'Country', 'Electronic', 'Jazz', 'Latin'])
+KEYS = np.array(['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B'])
+
+
+def make_songs(n_rows, seed=0):
+    """Synthetic raw song features and hit labels"""
+    rng = np.random.RandomState(seed)
+    df = pd.DataFrame({
+        'danceability': rng.uniform(size=n_rows),
+        'energy': rng.uniform(size=n_rows),
+        'valence': rng.uniform(size=n_rows),
+        'tempo': rng.normal(120, 25, size=n_rows),
+        'sentiment_compound': rng.uniform(-1, 1, size=n_rows),
+        'textblob_polarity': rng.uniform(-1, 1, size=n_rows),
+        'theme_love': rng.randint(0, 2, size=n_rows),
+        'word_count': rng.randint(50, 600, size=n_rows),
+        'unique_words': rng.randint(20, 300, size=n_rows),
+        'genre': GENRES[rng.randint(len(GENRES), size=n_rows)],
+        'key': KEYS[rng.randint(len(KEYS), size=n_rows)],
+    })
+    score = df['danceability'] + df['energy'] * df['valence'] + (df['genre'] == 'Pop') * 0.5
+    y = (score + rng.normal(scale=0.3, size=n_rows) > 1.2).astype(int)
+    return df, y
+
+
+def per_row_us(function, X, n_rows, repeats=5):
+    """Best-of-repeats microseconds per row of function(X)"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(X)
+        best = min(best, time.perf_counter() - start)
+    return best / n_rows * 1e6
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    df, y = make_songs(n_rows)
+    model_path = os.path.join(tempfile.mkdtemp(), 'hit_predictor.pkl')
+    trained = HitPredictor(model_path=model_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        trained.train_model(df, y)
+    expected = trained.pipeline.transform(df)
+
+    # Fresh predictor: pipeline and forest come back from the artifact directory
+    served = HitPredictor(model_path=model_path)
+    records = df.head(1_000).to_dict('records')
+    rows_from_dicts = np.vstack([served.transform(record) for record in records])
+    batch = served.predict_batch(df)
+    sklearn_proba = trained.model.predict_proba(expected)
+
+    # sklearn transformers and a pipeline fitted on the same rows
+    pipeline = served.pipeline
+    scaler = StandardScaler().fit(df[pipeline.numeric_columns])
+    encoder = OneHotEncoder(handle_unknown='ignore', sparse_output=False).fit(df[pipeline.categorical_columns])
+    reference = FeaturePipeline.fit(df)
+
+    def sklearn_transform(X):
+        return np.hstack([scaler.transform(X[pipeline.numeric_columns]),
+                          encoder.transform(X[pipeline.categorical_columns])])
+
+    print(f"Rows:                        {n_rows}")
+    print(f"Features:                    {len(pipeline.numeric_columns)} numeric "
+          f"({len(pipeline.lyric_columns)} lyric) + {len(pipeline.categorical_columns)} categorical "
+          f"-> {pipeline.n_features} columns")
+    print(f"Dict rows == training rows:  {np.array_equal(rows_from_dicts, expected[:len(records)])}")
+    print(f"Reloaded batch == training:  {np.array_equal(served.transform(df), expected)}")
+    print(f"Probabilities == sklearn:    {np.array_equal(batch['probability_top_chart'], sklearn_proba[:, 1])}")
+    print(f"Max diff vs sklearn fit:     {np.abs(reference.transform(df) - sklearn_transform(df)).max():.2e}")
+    print()
+    print(f"{'input':<22}{'pipeline':>14}{'sklearn':>14}")
+    frame_1 = df.head(1)
+    for name, X, n in (('1-row DataFrame', frame_1, 1), ('dict (one song)', records[0], 1),
+                       (f'{n_rows}-row DataFrame', df, n_rows)):
+        ours = per_row_us(pipeline.transform, X, n)
+        theirs = per_row_us(sklearn_transform, X if isinstance(X, pd.DataFrame) else pd.DataFrame([X]), n)
+        print(f"{name:<22}{ours:>11.2f}us{theirs:>11.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: sklearn predict_proba vs. the flat-array forest of ModelArtifact
+Usage (from Backend/): python -m benchmarks.bench_forest_inference [repeats]
+Both sides include scaling. Latency is the median over repeats for batches of
+1, 10, 1k and 100k rows; the probabilities must be identical, also for rows
+with missing (NaN) features.
+"""
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.bench_prediction import make_data, make_predictor
+
+BATCH_SIZES = (1, 10, 1_000, 100_000)
+
+
+def median_time(function, X, repeats):
+    """Median wall time of function(X) and its last output"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        output = function(X)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)), output
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    predictor = make_predictor()
+    model, scaler, artifact = predictor.model, predictor.scaler, predictor.artifact
+    X_all, _ = make_data(max(BATCH_SIZES), seed=1)
+
+    def sklearn_proba(X):
+        return model.predict_proba(scaler.transform(X))
+
+    def artifact_proba(X):
+        return artifact.predict_proba(artifact.transform(X))
+
+    print(f"Forest: {len(artifact.roots)} trees, {len(artifact.feature)} nodes")
+    print(f"{'batch':>8}{'sklearn':>14}{'numpy':>14}{'speedup':>10}  identical")
+    for batch_size in BATCH_SIZES:
+        X = X_all[:batch_size]
+        # Fewer repeats for the large batches
+        n = max(3, repeats * 10 // max(10, batch_size // 100)) if batch_size > 1_000 else repeats
+        sklearn_time, expected = median_time(sklearn_proba, X, n)
+        numpy_time, found = median_time(artifact_proba, X, n)
+        print(f"{batch_size:>8}{sklearn_time * 1e3:>12.3f}ms{numpy_time * 1e3:>12.3f}ms"
+              f"{sklearn_time / numpy_time:>9.1f}x  {np.array_equal(expected, found)}")
+
+    # sklearn routes NaN by each node's missing_go_to_left
+    X_missing = X_all[:10_000].copy()
+    X_missing[np.random.RandomState(2).uniform(size=X_missing.shape) < 0.2] = np.nan
+    print(f"NaN in 20% of features, 10k rows: identical "
+          f"{np.array_equal(sklearn_proba(X_missing), artifact_proba(X_missing))}")
+
+
+if __name__ == "__main__":
+    main()
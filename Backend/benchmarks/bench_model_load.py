@@ -0,0 +1,120 @@
+"""
+Benchmark: HitPredictor cold start and per-worker memory, pickle vs. mmap artifact
+Usage (from Backend/): python -m benchmarks.bench_model_load [n_workers] [n_trees]
+A synthetic forest (max_depth=None, so it is production-sized or larger) is
+saved as both the old pickle and the artifact directory. Each mode is run in
+fresh interpreters:
+  pickle:   import sklearn, unpickle the model, first prediction
+  artifact: import HitPredictor (no sklearn), lazy mmap load, first prediction
+Memory is read from /proc/<pid>/smaps_rollup while n_workers processes hold
+the model at once; PSS splits shared pages between them, so it shows what
+each extra worker really costs.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from benchmarks.bench_prediction import N_FEATURES, make_data
+
+WORKER = {
+    'pickle': """
+import pickle, time
+start = time.perf_counter()
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+with open(MODEL_PATH, 'rb') as f:
+    data = pickle.load(f)
+X = np.zeros((1, N_FEATURES))
+data['model'].predict_proba(data['scaler'].transform(X))
+""",
+    'artifact': """
+import time
+start = time.perf_counter()
+import numpy as np
+from modules.prediction import HitPredictor
+predictor = HitPredictor(model_path=MODEL_PATH)
+predictor.predict_batch(np.zeros((1, N_FEATURES)))
+""",
+}
+
+# Appended to both: report the cold-start time, then hold the model until stdin closes
+REPORT = """
+print(f'{time.perf_counter() - start:.6f}', flush=True)
+import sys
+sys.stdin.read()
+"""
+
+
+def read_smaps_rollup(pid):
+    """Rss, Pss and private (clean + dirty) memory of a process, in MiB"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    private = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    return fields.get('Rss', 0), fields.get('Pss', 0), private
+
+
+def run_workers(mode, model_path, n_workers):
+    """Start n_workers concurrently; returns cold-start seconds and memory rows"""
+    code = f"MODEL_PATH = {model_path!r}\nN_FEATURES = {N_FEATURES}\n" + WORKER[mode] + REPORT
+    workers = [
+        subprocess.Popen([sys.executable, '-c', code], stdin=subprocess.PIPE,
+                         stdout=subprocess.PIPE, text=True, cwd=os.getcwd())
+        for _ in range(n_workers)
+    ]
+    cold_starts = [float(worker.stdout.readline()) for worker in workers]
+    memory = [read_smaps_rollup(worker.pid) for worker in workers]
+    for worker in workers:
+        worker.stdin.close()
+        worker.wait()
+    return cold_starts, memory
+
+
+def main():
+    n_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    n_trees = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    from modules.model_artifact import ModelArtifact
+    from modules.prediction import HitPredictor
+
+    X, y = make_data(50_000)
+    predictor = HitPredictor(model_path=os.path.join(tempfile.mkdtemp(), 'hit_predictor.pkl'))
+    predictor.scaler = StandardScaler().fit(X)
+    predictor.model = RandomForestClassifier(
+        n_estimators=n_trees, random_state=42, class_weight='balanced', n_jobs=-1
+    ).fit(predictor.scaler.transform(X), y)
+    predictor.feature_importance = dict(enumerate(predictor.model.feature_importances_))
+    predictor.artifact = ModelArtifact.from_sklearn(predictor.model, predictor.scaler,
+                                                    predictor.feature_importance)
+    predictor.save_model()
+
+    pickle_size = os.path.getsize(predictor.model_path) / 2**20
+    artifact_size = sum(
+        os.path.getsize(os.path.join(predictor.artifact_path, name))
+        for name in os.listdir(predictor.artifact_path)
+    ) / 2**20
+    print(f"Model:    {n_trees} trees, {len(predictor.artifact.feature)} nodes")
+    print(f"On disk:  pickle {pickle_size:.1f} MiB, artifact {artifact_size:.1f} MiB")
+    print(f"Workers:  {n_workers} concurrent processes")
+    print()
+    print(f"{'mode':<10}{'cold start':>12}{'RSS MiB':>10}{'PSS MiB':>10}{'private MiB':>13}")
+    # Warm the page cache so both modes read the model from memory
+    run_workers('pickle', predictor.model_path, 1)
+    run_workers('artifact', predictor.model_path, 1)
+    for mode in ('pickle', 'artifact'):
+        cold_starts, memory = run_workers(mode, predictor.model_path, n_workers)
+        rss, pss, private = np.mean(memory, axis=0)
+        print(f"{mode:<10}{np.median(cold_starts):>11.3f}s{rss:>10.1f}{pss:>10.1f}{private:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
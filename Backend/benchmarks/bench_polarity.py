@@ -0,0 +1,59 @@
+"""
+Benchmark: TextBlob sentiment vs. LexiconSentiment throughput and agreement
+Usage (from Backend/): python -m benchmarks.bench_polarity [n_synthetic]
+Uses the bundled review samples plus synthetic lyrics.
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from textblob import TextBlob
+
+from benchmarks.bench_theme_matcher import make_corpus
+from modules.fast_sentiment import LexiconSentiment
+
+REVIEW_FILES = ['one_star_reviews_sample.csv', 'four_star_reviews_sample.csv']
+
+
+def textblob_scores(texts):
+    """Per-text TextBlob polarity/subjectivity, as LyricAnalyzer computed them"""
+    scores = np.zeros((len(texts), 2))
+    for row, text in enumerate(texts):
+        sentiment = TextBlob(text).sentiment
+        scores[row] = sentiment.polarity, sentiment.subjectivity
+    return scores
+
+
+def main():
+    n_synthetic = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    texts = []
+    for path in REVIEW_FILES:
+        texts += pd.read_csv(path)['Reviews'].astype(str).tolist()
+    texts += make_corpus(n_synthetic)
+
+    start = time.perf_counter()
+    reference = textblob_scores(texts)
+    textblob_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scorer = LexiconSentiment()
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = scorer.score_batch(texts)
+    fast_time = time.perf_counter() - start
+
+    diff = np.abs(reference - fast).max(axis=1)
+    print(f"Texts:               {len(texts)}")
+    print(f"TextBlob:            {textblob_time:.2f}s ({len(texts) / textblob_time:,.0f} texts/s)")
+    print(f"LexiconSentiment:    {fast_time:.2f}s ({len(texts) / fast_time:,.0f} texts/s, "
+          f"+{load_time:.2f}s lexicon load)")
+    print(f"Speedup:             {textblob_time / fast_time:.1f}x")
+    print(f"Exact (<1e-9):       {(diff < 1e-9).mean():.2%}")
+    print(f"Within 0.05:         {(diff < 0.05).mean():.2%}")
+    print(f"Max abs difference:  {diff.max():.4f}")
+
+
+if __name__ == "__main__":
+    main()
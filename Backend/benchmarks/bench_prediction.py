@@ -0,0 +1,78 @@
+"""
+Benchmark: per-song HitPredictor.predict vs. one predict_batch call
+Usage (from Backend/): python -m benchmarks.bench_prediction [n_songs]
+The model is a RandomForestClassifier with the production settings
+(100 trees, max_depth=10) fitted on synthetic features.
+"""
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from modules.model_artifact import ModelArtifact
+from modules.prediction import HitPredictor
+
+N_FEATURES = 24
+
+
+def make_data(n_rows, n_features=N_FEATURES, seed=0):
+    """Synthetic song features with a noisy non-linear hit label"""
+    rng = np.random.RandomState(seed)
+    X = rng.normal(size=(n_rows, n_features))
+    y = ((X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(scale=0.5, size=n_rows)) > 0.5).astype(int)
+    return X, y
+
+
+def make_predictor(n_train=5_000, seed=0):
+    """HitPredictor with a freshly fitted scaler and forest (nothing read from disk)"""
+    X, y = make_data(n_train, seed=seed)
+    predictor = HitPredictor(model_path=f'{tempfile.mkdtemp()}/hit_predictor.pkl')
+    predictor.scaler = StandardScaler().fit(X)
+    predictor.model = RandomForestClassifier(
+        n_estimators=100, max_depth=10, random_state=42, class_weight='balanced'
+    ).fit(predictor.scaler.transform(X), y)
+    predictor.artifact = ModelArtifact.from_sklearn(predictor.model, predictor.scaler)
+    return predictor
+
+
+def main():
+    n_songs = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    predictor = make_predictor()
+    X, _ = make_data(n_songs, seed=1)
+    # The per-song loop is timed on a sample and extrapolated
+    n_loop = min(n_songs, 500)
+
+    start = time.perf_counter()
+    for row in X[:n_loop]:
+        scaled = predictor.scaler.transform(row.reshape(1, -1))
+        predictor.model.predict_proba(scaled)
+        predictor.model.predict(scaled)
+    legacy_time = (time.perf_counter() - start) * n_songs / n_loop
+
+    start = time.perf_counter()
+    for row in X[:n_loop]:
+        predictor.predict(row)
+    wrapper_time = (time.perf_counter() - start) * n_songs / n_loop
+
+    start = time.perf_counter()
+    batch = predictor.predict_batch(X)
+    batch_time = time.perf_counter() - start
+
+    scaled = predictor.scaler.transform(X)
+    matches = (
+        np.array_equal(batch['prediction'], predictor.model.predict(scaled))
+        and np.array_equal(batch['probability_top_chart'], predictor.model.predict_proba(scaled)[:, 1])
+    )
+
+    print(f"Songs:                 {n_songs}")
+    print(f"Per-song, two passes:  {legacy_time:.2f}s (extrapolated from {n_loop})")
+    print(f"Per-song predict():    {wrapper_time:.2f}s (extrapolated from {n_loop})")
+    print(f"predict_batch():       {batch_time:.3f}s ({legacy_time / batch_time:.0f}x)")
+    print(f"Outputs match sklearn: {matches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: MinHash-LSH index build, save/load (memory-mapped), incremental insert,
+query latency and recall@k against exact binary cosine
+Usage (from Backend/): python -m benchmarks.bench_similarity_index [n_songs] [num_perm] [bands]
+Synthetic songs are noisy variants of shared "originals" so that true
+neighbours exist. Words are drawn from a Zipf-distributed vocabulary, as in
+real lyrics, so unrelated songs still share their common words; candidates
+per query show how much of the index the LSH bands let through. Token sets
+come from Cosine_Similarity.build_term_vector.
+"""
+import itertools
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from Cosine_Similarity import build_term_vector
+from modules.similarity_index import MinHashLSHIndex, recall_report
+
+STOP_WORDS = frozenset(['i', 'you', 'the', 'a', 'and', 'we', 'it', 'me', 'my', 'your'])
+
+
+def make_token_sets(n_songs, vocab_size=20_000, words_per_song=150, variants=11, noise=0.2,
+                    zipf=1.0, seed=0):
+    """
+    Token sets of songs derived from n_songs / variants originals with word
+    substitutions; word rank r is drawn with probability proportional to
+    1 / r ** zipf (zipf=0 gives a uniform vocabulary)
+    """
+    rng = random.Random(seed)
+    vocab = [f'w{i}' for i in range(vocab_size)]
+    cum_weights = list(itertools.accumulate(1 / rank ** zipf for rank in range(1, vocab_size + 1)))
+
+    def draw(n):
+        return rng.choices(vocab, cum_weights=cum_weights, k=n)
+
+    originals = [draw(words_per_song) for _ in range(max(1, n_songs // variants))]
+    token_sets = []
+    for song in range(n_songs):
+        substitutes = draw(words_per_song)
+        words = [
+            substitute if rng.random() < noise else word
+            for word, substitute in zip(originals[song % len(originals)], substitutes)
+        ]
+        terms, _ = build_term_vector(words, STOP_WORDS)
+        token_sets.append(terms.tolist())
+    return token_sets
+
+
+def main():
+    n_songs = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    num_perm = int(sys.argv[2]) if len(sys.argv) > 2 else 128
+    bands = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+    token_sets = make_token_sets(n_songs)
+    split = int(n_songs * 0.9)
+    path = tempfile.mkdtemp(prefix='lsh_index_')
+
+    try:
+        index = MinHashLSHIndex(num_perm=num_perm, bands=bands)
+        start = time.perf_counter()
+        for key, tokens in enumerate(token_sets[:split]):
+            index.add(key, tokens)
+        index.save(path)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = MinHashLSHIndex.load(path)
+        load_time = time.perf_counter() - start
+
+        # Remaining songs go through the incremental (unsaved) tier
+        start = time.perf_counter()
+        for key, tokens in enumerate(token_sets[split:], start=split):
+            index.add(key, tokens)
+        insert_time = time.perf_counter() - start
+
+        report = recall_report(index, token_sets, k=10)
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+    print(f"Songs:              {n_songs} ({split} saved + {n_songs - split} inserted)")
+    print(f"Signature/LSH:      {num_perm} permutations, {bands} bands x {num_perm // bands} rows")
+    print(f"Build + save:       {build_time:.2f}s")
+    print(f"Load (mmap):        {load_time * 1000:.2f}ms")
+    print(f"Incremental insert: {insert_time / max(1, n_songs - split) * 1000:.3f}ms/song")
+    print(f"Query latency:      {report['mean_query_ms']:.3f}ms mean, {report['p99_query_ms']:.3f}ms p99")
+    print(f"Candidates/query:   {report['mean_candidates']:.1f} "
+          f"({report['mean_candidates'] / n_songs:.2%} of the index)")
+    print(f"Recall@{report['k']}:          {report['recall']:.3f} vs exact binary cosine "
+          f"({report['queries']} queries)")
+    print(f"Cosine estimate:    {report['mean_abs_cosine_error']:.3f} mean absolute error")
+
+
+if __name__ == "__main__":
+    main()
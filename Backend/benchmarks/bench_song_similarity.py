@@ -0,0 +1,40 @@
+"""
+Benchmark: blocked all-pairs top-k song similarity vs. the dense N x N matrix it avoids
+Usage (from Backend/): python -m benchmarks.bench_song_similarity [n_songs] [k] [max_block_mb]
+"""
+import resource
+import sys
+import time
+
+from benchmarks.bench_theme_matcher import make_corpus
+from modules.song_similarity import build_song_matrix, top_k_similar
+
+STOP_WORDS = frozenset(['i', 'you', 'the', 'a', 'and', 'we', 'it', 'me', 'my', 'your'])
+
+
+def main():
+    n_songs = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    max_block_mb = int(sys.argv[3]) if len(sys.argv) > 3 else 256
+    corpus = make_corpus(n_songs)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    matrix = build_song_matrix(corpus, STOP_WORDS)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pairs = top_k_similar(matrix, k=k, max_block_mb=max_block_mb)
+    search_time = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(f"Songs:              {n_songs}")
+    print(f"Matrix build:       {build_time:.2f}s ({matrix.nnz} non-zeros)")
+    print(f"Top-{k} search:      {search_time:.2f}s ({n_songs / search_time:.0f} songs/s)")
+    print(f"Pairs kept:         {len(pairs)} ({pairs.memory_usage(index=False).sum() / 2 ** 20:.1f} MiB)")
+    print(f"Peak RSS growth:    {(peak_rss - baseline_rss) / 1024:.0f} MiB (block cap {max_block_mb} MiB)")
+    print(f"Dense N x N float32 would need {n_songs * n_songs * 4 / 2 ** 20:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark: cold import time of app.py, main.py and the NLTK-using modules
+Usage (from Backend/): python -m benchmarks.bench_startup [backend_dir] [repeats]
+Point backend_dir at another checkout (e.g. a git worktree of an older
+revision) to compare before/after.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MODULES = ['app', 'main', 'modules.lyric_analysis', 'Cosine_Similarity']
+
+
+def time_import(backend_dir, module, repeats):
+    """Median wall time of a fresh interpreter importing `module`"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-c', f'import {module}'],
+            cwd=backend_dir, capture_output=True, text=True
+        )
+        timings.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1]
+    return statistics.median(timings), None
+
+
+def main():
+    default_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    backend_dir = sys.argv[1] if len(sys.argv) > 1 else default_dir
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    # Baseline: bare interpreter startup
+    baseline, _ = time_import(backend_dir, 'sys', repeats)
+    print(f"Backend dir: {backend_dir}")
+    print(f"{'python -c':<32}{baseline:.3f}s")
+    for module in MODULES:
+        seconds, error = time_import(backend_dir, module, repeats)
+        if error:
+            print(f"{'import ' + module:<32}failed: {error}")
+        else:
+            print(f"{'import ' + module:<32}{seconds:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: per-theme keyword scan vs. single-pass ThemeMatcher, PhraseThemeMatcher
+(Aho-Corasick) and SparseThemeScorer, plus automaton scaling with lexicon size
+Usage (from Backend/): python -m benchmarks.bench_theme_matcher [n_songs]
+"""
+import random
+import re
+import sys
+import time
+
+from modules.theme_matcher import ThemeMatcher, PhraseThemeMatcher, SparseThemeScorer
+
+THEME_KEYWORDS = {
+    'love': ['love', 'heart', 'baby', 'kiss', 'hold', 'touch', 'darling', 'sweet'],
+    'party': ['party', 'dance', 'night', 'club', 'fun', 'drink', 'celebrate', 'dj', 'music'],
+    'breakup': ['break', 'hurt', 'pain', 'tears', 'leave', 'goodbye', 'gone', 'cry'],
+    'empowerment': ['strong', 'power', 'rise', 'fight', 'win', 'queen', 'resist', 'freedom', 'stand'],
+    'money': ['money', 'cash', 'rich', 'dollar', 'gold', 'bling', 'spend', 'paid'],
+    'violence': ['gun', 'kill', 'shot', 'blood', 'fight', 'war', 'die', 'enemy'],
+    'sex': ['body', 'touch', 'bed', 'lips', 'skin', 'naked', 'desire', 'moan'],
+    'faith': ['god', 'pray', 'church', 'blessed', 'faith', 'heaven', 'lord', 'soul'],
+    'struggle': ['fight', 'hard', 'broke', 'pain', 'tough', 'lost', 'suffer', 'battle'],
+    'drugs': ['smoke', 'weed', 'high', 'roll', 'pill', 'dope', 'lean', 'trip'],
+    'nostalgia': ['remember', 'old', 'days', 'back', 'time', 'school', 'childhood', 'memory'],
+    'friendship': ['friend', 'homie', 'crew', 'ride', 'loyal', 'brother', 'sister'],
+    'loneliness': ['alone', 'lonely', 'empty', 'nobody', 'silent', 'dark'],
+    'fame': ['fame', 'spotlight', 'stage', 'fans', 'star', 'show', 'interview'],
+    'freedom': ['free', 'fly', 'escape', 'run', 'break', 'chains'],
+}
+
+FILLER = ['i', 'you', 'the', 'a', 'and', 'we', 'it', 'me', 'my', 'your', 'oh', 'yeah',
+          'know', 'want', 'go', 'all', 'just', 'like', 'get', 'got', 'now', 'say', 'see']
+
+
+def make_corpus(n_songs, words_per_song=250, seed=0):
+    """Build synthetic lyrics mixing filler words with theme keywords"""
+    rng = random.Random(seed)
+    vocab = FILLER * 4 + [kw for kws in THEME_KEYWORDS.values() for kw in kws]
+    return [
+        ' '.join(rng.choice(vocab) for _ in range(words_per_song)).capitalize()
+        for _ in range(n_songs)
+    ]
+
+
+def legacy_detect(text, theme):
+    """Original LyricAnalyzer._detect_theme implementation"""
+    if not isinstance(text, str) or theme not in THEME_KEYWORDS:
+        return 0
+    words = re.findall(r'\w+', text.lower())
+    return int(any(keyword in words for keyword in THEME_KEYWORDS[theme]))
+
+
+def make_phrase_lexicon(n_keywords, n_themes=15, seed=0):
+    """Synthetic lexicon of 1-3 word keywords drawn from a 5k-word vocabulary"""
+    rng = random.Random(seed)
+    words = [f'w{i}' for i in range(5000)]
+    return {
+        f'theme{t}': [
+            ' '.join(rng.choice(words) for _ in range(rng.randint(1, 3)))
+            for _ in range(n_keywords // n_themes)
+        ]
+        for t in range(n_themes)
+    }
+
+
+def bench_lexicon_scaling(n_songs, sizes=(100, 1_000, 10_000, 50_000)):
+    """Automaton scan time should stay flat as the lexicon grows"""
+    rng = random.Random(1)
+    corpus = [' '.join(f'w{rng.randrange(5000)}' for _ in range(250)) for _ in range(n_songs)]
+    print(f"\nAho-Corasick scaling ({n_songs} songs, 1-3 word keywords)")
+    for size in sizes:
+        start = time.perf_counter()
+        matcher = PhraseThemeMatcher(make_phrase_lexicon(size))
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for text in corpus:
+            matcher.count(text)
+        scan_time = time.perf_counter() - start
+        print(f"  {size:>6} keywords: build {build_time:.3f}s, scan {scan_time:.2f}s")
+
+
+def main():
+    n_songs = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    corpus = make_corpus(n_songs)
+    matcher = ThemeMatcher(THEME_KEYWORDS)
+
+    start = time.perf_counter()
+    legacy = [
+        {f'theme_{theme}': legacy_detect(text, theme) for theme in THEME_KEYWORDS}
+        for text in corpus
+    ]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [matcher.match(text) for text in corpus]
+    compiled_time = time.perf_counter() - start
+
+    automaton = PhraseThemeMatcher(THEME_KEYWORDS)
+    start = time.perf_counter()
+    phrase = [automaton.match(text) for text in corpus]
+    automaton_time = time.perf_counter() - start
+
+    scorer = SparseThemeScorer(THEME_KEYWORDS)
+    start = time.perf_counter()
+    flags, _, _ = scorer.match(corpus)
+    sparse_time = time.perf_counter() - start
+    sparse = [
+        {f'theme_{theme}': int(flag) for theme, flag in zip(THEME_KEYWORDS, row)}
+        for row in flags
+    ]
+
+    print(f"Songs:            {n_songs}")
+    print(f"Per-theme scan:   {legacy_time:.2f}s")
+    print(f"ThemeMatcher:     {compiled_time:.2f}s")
+    print(f"Aho-Corasick:     {automaton_time:.2f}s")
+    print(f"Sparse matmul:    {sparse_time:.2f}s")
+    print(f"Speedup (index):  {legacy_time / compiled_time:.1f}x")
+    print(f"Speedup (sparse): {legacy_time / sparse_time:.1f}x")
+    print(f"Outputs match:    {legacy == compiled == phrase == sparse}")
+
+    bench_lexicon_scaling(min(n_songs, 10_000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: shared fast tokenizer vs. nltk.word_tokenize, plus output agreement
+Usage (from Backend/): python -m benchmarks.bench_tokenizer [repeats]
+Uses the review sample CSVs. When the punkt models are not installed, the
+reference is NLTK's word tokenizer over a regex sentence split (word_tokenize
+without punkt) and the report says so.
+"""
+import re
+import sys
+import time
+from collections import Counter
+
+import pandas as pd
+
+from Cosine_Similarity import build_term_vector, sparse_cosine
+from modules.tokenizer import alpha_words, tokenize, tokenize_batch, word_tokens
+
+SAMPLES = ('one_star_reviews_sample.csv', 'four_star_reviews_sample.csv')
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def reference_tokenizer():
+    """(name, callable) for nltk.word_tokenize, or its punkt-free approximation"""
+    from modules.nltk_resources import get_word_tokenize
+    try:
+        return 'nltk.word_tokenize', get_word_tokenize()
+    except LookupError:
+        from nltk.tokenize import NLTKWordTokenizer
+        tokenizer = NLTKWordTokenizer()
+
+        def word_tokenize(text):
+            return [token for sentence in SENTENCE_END.split(text) for token in tokenizer.tokenize(sentence)]
+        return 'NLTKWordTokenizer + regex sentences (punkt not installed)', word_tokenize
+
+
+def timed(function, texts, repeats):
+    """Best-of-repeats wall time and the outputs of the last run"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        outputs = [function(text) for text in texts]
+        best = min(best, time.perf_counter() - start)
+    return best, outputs
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    frames = [pd.read_csv(path)['Reviews'].astype(str) for path in SAMPLES]
+    texts = [text.lower() for frame in frames for text in frame]
+    name, word_tokenize = reference_tokenizer()
+
+    ref_time, expected = timed(word_tokenize, texts, repeats)
+    fast_time, found = timed(tokenize, texts, repeats)
+    start = time.perf_counter()
+    tokenize_batch(texts, intern=True)
+    batch_time = time.perf_counter() - start
+
+    exact = sum(a == b for a, b in zip(expected, found))
+    shared = sum((Counter(a) & Counter(b)).total() for a, b in zip(expected, found))
+    total = sum(max(len(a), len(b)) for a, b in zip(expected, found))
+
+    # File-level binary cosine, as Cosine_Similarity computes it
+    cosines = []
+    for tokenizer in (word_tokenize, tokenize):
+        vectors = [build_term_vector(tokenizer(' '.join(frame).lower()), set()) for frame in frames]
+        cosines.append(sparse_cosine(*vectors))
+
+    # The simpler tokenizers must match the code they replaced exactly
+    legacy_alpha = [[w.lower() for w in text.split() if w.isalpha()] for text in texts]
+    legacy_word = [re.findall(r'\w+', text.lower()) for text in texts]
+
+    print(f"Texts:              {len(texts)} reviews")
+    print(f"Reference:          {name}")
+    print(f"Reference time:     {ref_time:.3f}s")
+    print(f"Fast tokenize:      {fast_time:.3f}s ({ref_time / fast_time:.1f}x)")
+    print(f"Batch + interning:  {batch_time:.3f}s")
+    print(f"Identical outputs:  {exact}/{len(texts)} texts ({exact / len(texts):.1%})")
+    print(f"Token agreement:    {shared / total:.2%}")
+    print(f"File cosine:        reference {cosines[0]:.6f}, fast {cosines[1]:.6f}")
+    print(f"alpha_words match:  {legacy_alpha == [alpha_words(text) for text in texts]}")
+    print(f"word_tokens match:  {legacy_word == [word_tokens(text) for text in texts]}")
+
+
+if __name__ == "__main__":
+    main()
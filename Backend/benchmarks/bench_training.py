@@ -0,0 +1,81 @@
+"""
+Benchmark: HitPredictor training cost for planning retraining windows
+Usage (from Backend/): python -m benchmarks.bench_training [time_budget_seconds]
+Reports forest fit time versus rows and trees (fit_time_report), one core
+vs. all cores, a warm-start grow vs. a full refit, and a time-budgeted
+cross-validated hyperparameter search, on synthetic song features.
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_feature_pipeline import make_songs
+from benchmarks.bench_prediction import make_data
+from modules.prediction import HitPredictor, fit_time_report
+
+SEARCH_GRID = {
+    'n_estimators': [50, 100],
+    'max_depth': [8, 10, None],
+    'min_samples_leaf': [1, 5],
+}
+
+
+def timed(function, *args, **kwargs):
+    """Wall time of one call, with training printouts silenced"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    time_budget = float(sys.argv[1]) if len(sys.argv) > 1 else 30
+    n_cores = os.cpu_count() or 1
+
+    X, y = make_data(100_000)
+    report = fit_time_report(X, y, row_counts=(10_000, 50_000, 100_000), tree_counts=(50, 100, 200))
+    print(f"Fit time vs. rows and trees (max_depth 10, {n_cores} cores):")
+    print(report.to_string(index=False, float_format=lambda v: f'{v:.3f}'))
+
+    df, labels = make_songs(60_000)
+    new_df, new_labels = make_songs(20_000, seed=1)
+    model_path = os.path.join(tempfile.mkdtemp(), 'hit_predictor.pkl')
+    predictor = HitPredictor(model_path=model_path)
+    one_core = timed(predictor.train_model, df, labels, n_jobs=1)
+    all_cores = timed(predictor.train_model, df, labels, n_jobs=-1)
+    grow = timed(predictor.grow_model, new_df, new_labels, n_new_trees=50)
+    n_trees = len(predictor.model.estimators_)
+    reloaded = HitPredictor(model_path=model_path)
+    reloaded.predict_batch(new_df.head(1))
+    refit = timed(HitPredictor(model_path=tempfile.mkdtemp() + '/refit.pkl').train_model,
+                  pd.concat([df, new_df], ignore_index=True), pd.concat([labels, new_labels]),
+                  params={'n_estimators': n_trees})
+
+    print()
+    print(f"train_model, 60k songs, n_jobs=1:    {one_core:.2f}s")
+    print(f"train_model, 60k songs, n_jobs=-1:   {all_cores:.2f}s ({one_core / all_cores:.1f}x on {n_cores} cores)")
+    print(f"grow_model, +50 trees on 20k songs:  {grow:.2f}s (-> {n_trees} trees)")
+    print(f"full refit, {n_trees} trees on 80k songs:  {refit:.2f}s")
+    print(f"Trees in the reloaded artifact:      {len(reloaded.artifact.roots)}")
+
+    start = time.perf_counter()
+    best_params, results = HitPredictor(model_path=model_path).search_hyperparameters(
+        df.head(20_000), labels[:20_000], param_grid=SEARCH_GRID, time_budget=time_budget
+    )
+    elapsed = time.perf_counter() - start
+    n_candidates = int(np.prod([len(values) for values in SEARCH_GRID.values()]))
+    print()
+    print(f"Search: {len(results)}/{n_candidates} candidates in {elapsed:.1f}s "
+          f"(budget {time_budget:.0f}s, 3-fold CV, 20k songs)")
+    print(results.head(5).to_string(index=False, float_format=lambda v: f'{v:.3f}'))
+    print(f"Best: {best_params}")
+
+
+if __name__ == "__main__":
+    main()
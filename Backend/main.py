@@ -4,11 +4,12 @@ import pandas as pd
 from dotenv import load_dotenv
 from modules.data_collection import AcousticBrainzCollector
 from modules.lyric_analysis import LyricAnalyzer
+from modules.analysis_cache import AnalysisCache
+from modules.corpus_stats import CorpusStats
 from modules.prediction import HitPredictor
 from modules.lyric_fetcher import GeniusLyricFetcher
 from modules.spotify_integration import SpotifyCollector
 from utils.helpers import format_features
-import nltk
 from textwrap import fill
 
 # Fix SSL certificate issues
@@ -19,9 +20,7 @@ except AttributeError:
 else:
     ssl._create_default_https_context = _create_unverified_https_context
 
-# Download NLTK data
-nltk.download('stopwords')
-nltk.download('vader_lexicon')
+# NLTK data is loaded lazily from Backend/nltk_data (see modules/nltk_dwnld.py)
 
 load_dotenv()
 
@@ -46,7 +45,7 @@ def print_analysis(song_data, index=None):
     # Detected Themes
     themes = [theme.replace('theme_', '') 
              for theme, detected in song_data.items() 
-             if theme.startswith('theme_') and detected == 1]
+             if theme.startswith('theme_') and not theme.endswith(('_hits', '_score')) and detected == 1]
     if themes:
         print("\n\033[1;35mDetected Themes:\033[0m")
         for theme in themes:
@@ -65,7 +64,10 @@ def main():
     # Initialize components
     collector = AcousticBrainzCollector()
     spotify_collector = SpotifyCollector()
-    lyric_analyzer = LyricAnalyzer()
+    lyric_analyzer = LyricAnalyzer(
+        cache=AnalysisCache(db_path='data/cache/lyric_analysis.sqlite'),
+        corpus_stats=CorpusStats(db_path='data/corpus/corpus_stats.sqlite')
+    )
     # predictor = HitPredictor()
     
     # Configuration
@@ -107,6 +109,7 @@ def main():
     # Lyric Analysis
     print("\nAnalyzing lyrics...")
     analyzed_df = lyric_analyzer.analyze(tracks_df)
+    print(f"Analysis cache: {lyric_analyzer.cache.stats()}")
 
     #Print results
     for idx, song in analyzed_df.iterrows():
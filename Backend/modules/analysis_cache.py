@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+def normalize_lyrics(text):
+    """Normalize line endings and surrounding whitespace without changing scores"""
+    lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines).strip()
+
+
+class AnalysisCache:
+    def __init__(self, max_entries=10000, db_path=None):
+        """
+        Content-addressed cache for per-song lyric analysis results
+        Args:
+            max_entries: size bound of the in-memory LRU tier
+            db_path: optional SQLite file for a persistent second tier
+        """
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._batch_depth = 0
+
+        self._db = None
+        if db_path:
+            if os.path.dirname(db_path):
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS analysis (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(lyrics, version):
+        """Hash normalized lyrics together with the analyzer/lexicon version"""
+        payload = f"{version}\0{normalize_lyrics(lyrics)}".encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key):
+        """Return cached result dict or None"""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return dict(value)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value FROM analysis WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    value = json.loads(row[0])
+                    self._put_memory(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return dict(value)
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Store a result dict in both tiers"""
+        with self._lock:
+            self._put_memory(key, dict(value))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO analysis (key, value) VALUES (?, ?)",
+                    (key, json.dumps(value))
+                )
+                if not self._batch_depth:
+                    self._db.commit()
+
+    @contextmanager
+    def batch(self):
+        """
+        Group puts into one SQLite transaction, committed when the block exits
+        (committing per put dominates the cost of filling the disk tier)
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._db is not None:
+                    self._db.commit()
+
+    def _put_memory(self, key, value):
+        """Insert into the LRU tier, evicting least recently used entries"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop all cached entries (both tiers) and reset counters"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM analysis")
+                self._db.commit()
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return hit/miss/eviction counters for sizing the cache"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'memory_entries': len(self._memory),
+            'max_entries': self.max_entries
+        }
+
+    def close(self):
+        """Close the SQLite connection if one is open"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
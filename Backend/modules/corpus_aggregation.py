@@ -0,0 +1,149 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+
+import pandas as pd
+
+from modules.tokenizer import alpha_words
+
+
+class MisraGries:
+    def __init__(self, max_counters):
+        """
+        Bounded-memory heavy-hitters summary (Misra-Gries)
+        Keeps at most max_counters terms; any term occurring more than
+        n / (max_counters + 1) times is guaranteed to be kept, and each
+        count is an underestimate by at most that amount.
+        """
+        self.max_counters = max_counters
+        self.counters = {}
+
+    def update(self, terms):
+        """Add an iterable of terms"""
+        counters = self.counters
+        for term in terms:
+            if term in counters:
+                counters[term] += 1
+            elif len(counters) < self.max_counters:
+                counters[term] = 1
+            else:
+                for key in list(counters):
+                    counters[key] -= 1
+                    if counters[key] == 0:
+                        del counters[key]
+        return self
+
+    def merge(self, other):
+        """Merge another summary (mergeable-summaries rule: add, then trim)"""
+        for term, count in other.counters.items():
+            self.counters[term] = self.counters.get(term, 0) + count
+        if len(self.counters) > self.max_counters:
+            cutoff = sorted(self.counters.values(), reverse=True)[self.max_counters]
+            self.counters = {
+                term: count - cutoff
+                for term, count in self.counters.items() if count > cutoff
+            }
+        return self
+
+    def most_common(self, k):
+        """Top-k (term, estimated count) pairs"""
+        return Counter(self.counters).most_common(k)
+
+
+def extract_terms(text, stop_words, ngram_range=(1, 2)):
+    """
+    Lowercased alphabetic non-stopword unigrams and/or space-joined n-grams
+    Tokenization matches LyricAnalyzer.get_top_words.
+    """
+    words = [word for word in alpha_words(text) if word not in stop_words]
+    terms = []
+    low, high = ngram_range
+    for n in range(low, high + 1):
+        if n == 1:
+            terms.extend(words)
+        else:
+            terms.extend(' '.join(words[i:i + n]) for i in range(len(words) - n + 1))
+    return terms
+
+
+def _new_counter(max_counters):
+    """Exact Counter, or a Misra-Gries summary when memory is bounded"""
+    return MisraGries(max_counters) if max_counters else Counter()
+
+
+def _merge(total, partial):
+    """Merge a partial counter into the running total"""
+    if isinstance(total, MisraGries):
+        return total.merge(partial)
+    total.update(partial)
+    return total
+
+
+def _count_chunk(args):
+    """Map step: count terms per group for one chunk of (groups, lyrics) rows"""
+    groups, lyrics, stop_words, ngram_range, max_counters = args
+    partials = {}
+    for row_groups, text in zip(groups, lyrics):
+        terms = extract_terms(text, stop_words, ngram_range)
+        if not terms:
+            continue
+        for group in row_groups:
+            counter = partials.get(group)
+            if counter is None:
+                counter = partials[group] = _new_counter(max_counters)
+            counter.update(terms)
+    return partials
+
+
+def top_terms(groups, lyrics, stop_words, k=10, ngram_range=(1, 2),
+              max_counters=None, n_jobs=1, chunk_size=None):
+    """
+    Corpus-level top-k terms per group with map-reduce over chunks
+    Args:
+        groups: list where each entry is the list of groups a song belongs to
+        lyrics: list of lyrics strings, aligned with groups
+        stop_words: set of words to ignore
+        k: terms to return per group
+        ngram_range: (min_n, max_n), e.g. (1, 1) unigrams, (2, 2) bigrams
+        max_counters: use Misra-Gries with this many counters per group
+            instead of exact counts (bounded memory for huge vocabularies)
+        n_jobs: worker processes (-1 = all cores)
+        chunk_size: songs per map task
+    Returns:
+        DataFrame with columns group, rank, term, count
+    """
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(lyrics) / (n_jobs * 4)))
+
+    tasks = [
+        (groups[start:start + chunk_size], lyrics[start:start + chunk_size],
+         stop_words, ngram_range, max_counters)
+        for start in range(0, len(lyrics), chunk_size)
+    ]
+    if n_jobs == 1 or len(tasks) <= 1:
+        partials = map(_count_chunk, tasks)
+    else:
+        pool = ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks)))
+        partials = pool.map(_count_chunk, tasks)
+
+    # Reduce step: merge partial counters group by group
+    totals = {}
+    try:
+        for partial in partials:
+            for group, counter in partial.items():
+                if group in totals:
+                    totals[group] = _merge(totals[group], counter)
+                else:
+                    totals[group] = counter
+    finally:
+        if n_jobs != 1 and len(tasks) > 1:
+            pool.shutdown()
+
+    rows = []
+    for group in sorted(totals, key=str):
+        for rank, (term, count) in enumerate(totals[group].most_common(k), start=1):
+            rows.append({'group': group, 'rank': rank, 'term': term, 'count': count})
+    return pd.DataFrame(rows, columns=['group', 'rank', 'term', 'count'])
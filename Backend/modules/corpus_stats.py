@@ -0,0 +1,134 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from modules.analysis_cache import normalize_lyrics
+
+
+class CorpusStats:
+    def __init__(self, db_path=None):
+        """
+        Incrementally updated document frequencies for TF-IDF weighting
+        Args:
+            db_path: optional SQLite file; statistics persist across runs
+        Documents are identified by a hash of their normalized text, so
+        re-submitting the same lyrics does not inflate the counts.
+        """
+        self.db_path = db_path
+        self.doc_freq = {}
+        self.n_docs = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+        # Sorted (terms, doc_freqs) arrays for vectorized idf lookups, rebuilt lazily
+        self._arrays = None
+
+        self._db = None
+        if db_path:
+            if os.path.dirname(db_path):
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            self._db.execute("CREATE TABLE IF NOT EXISTS vocab (term TEXT PRIMARY KEY, df INTEGER NOT NULL)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS docs (doc_key TEXT PRIMARY KEY)")
+            self._db.commit()
+            self.doc_freq = dict(self._db.execute("SELECT term, df FROM vocab"))
+            self._seen = {row[0] for row in self._db.execute("SELECT doc_key FROM docs")}
+            self.n_docs = len(self._seen)
+
+    @staticmethod
+    def doc_key(text):
+        """Stable document id from normalized text"""
+        return hashlib.sha1(normalize_lyrics(text).encode('utf-8')).hexdigest()
+
+    def add_documents(self, documents):
+        """
+        Add documents given as (text, tokens) pairs; already seen texts are skipped
+        Returns:
+            Number of new documents counted
+        """
+        new_keys = []
+        increments = {}
+        with self._lock:
+            for text, tokens in documents:
+                if not isinstance(text, str):
+                    continue
+                key = self.doc_key(text)
+                if key in self._seen:
+                    continue
+                self._seen.add(key)
+                new_keys.append(key)
+                for term in set(tokens):
+                    increments[term] = increments.get(term, 0) + 1
+
+            for term, count in increments.items():
+                self.doc_freq[term] = self.doc_freq.get(term, 0) + count
+            self.n_docs += len(new_keys)
+            if new_keys:
+                self._arrays = None
+
+            if self._db is not None and new_keys:
+                self._db.executemany(
+                    "INSERT INTO vocab (term, df) VALUES (?, ?) "
+                    "ON CONFLICT(term) DO UPDATE SET df = df + excluded.df",
+                    increments.items()
+                )
+                self._db.executemany("INSERT OR IGNORE INTO docs (doc_key) VALUES (?)",
+                                     ((key,) for key in new_keys))
+                self._db.commit()
+        return len(new_keys)
+
+    def idf(self, term):
+        """Smoothed inverse document frequency: ln((1 + N) / (1 + df)) + 1"""
+        return math.log((1 + self.n_docs) / (1 + self.doc_freq.get(term, 0))) + 1
+
+    def idf_array(self, terms):
+        """
+        Vectorized idf for an array (or list) of terms
+        Looks terms up by binary search in a sorted snapshot of the vocabulary,
+        so there is no per-term Python work even for millions of terms.
+        """
+        with self._lock:
+            if self._arrays is None:
+                # dtype=object: a str array pads every term to the longest one
+                vocab = np.array(list(self.doc_freq), dtype=object)
+                doc_freqs = np.fromiter(self.doc_freq.values(), dtype=np.int64, count=len(self.doc_freq))
+                order = np.argsort(vocab)
+                self._arrays = (vocab[order], doc_freqs[order])
+            vocab, doc_freqs = self._arrays
+            n_docs = self.n_docs
+        
+        terms = np.asarray(terms, dtype=object)
+        doc_freq = np.zeros(len(terms), dtype=np.int64)
+        if len(vocab):
+            positions = np.minimum(np.searchsorted(vocab, terms), len(vocab) - 1)
+            found = vocab[positions] == terms
+            doc_freq[found] = doc_freqs[positions[found]]
+        return np.log((1 + n_docs) / (1 + doc_freq)) + 1
+
+    def tfidf(self, tokens, normalize=True):
+        """
+        TF-IDF weights for one document's tokens, in O(len(tokens))
+        Returns:
+            dict term -> weight (L2-normalized when normalize=True)
+        """
+        counts = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        weights = {term: tf * self.idf(term) for term, tf in counts.items()}
+        if normalize and weights:
+            norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+            weights = {term: weight / norm for term, weight in weights.items()}
+        return weights
+
+    def stats(self):
+        """Document count and vocabulary size"""
+        return {'n_docs': self.n_docs, 'vocab_size': len(self.doc_freq)}
+
+    def close(self):
+        """Close the SQLite connection if one is open"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,134 @@
+import re
+
+import numpy as np
+
+# Same punctuation set as pattern/TextBlob, minus the apostrophe (treated as a separator)
+PUNCTUATION = ".,;:!?()[]{}`\"@#$^&*+-|=~_"
+_P = re.escape(PUNCTUATION)
+
+# Words keep inner punctuation ("well-known"); '!' and '...' are kept as tokens
+# because they affect scoring. Quotes/apostrophes split words like TextBlob does.
+# Leading periods stay attached ("....first"), as pattern only splits them off the end.
+WORD_PATTERN = rf"\.*[^\s{_P}]+(?:[{_P}]+[^\s{_P}]+)*|\.\.\.|!"
+SARCASM_PATTERN = r"\(\s?!\s?\)"
+QUOTES = re.compile(r"['\"‘’“”]")
+
+NEGATIONS = frozenset(("no", "not", "n't", "never"))
+
+
+class LexiconSentiment:
+    def __init__(self):
+        """
+        TextBlob/pattern polarity and subjectivity without building TextBlob objects
+        Loads the pattern en-sentiment lexicon once into a flat
+        {word: (polarity, subjectivity, intensity)} dict and reimplements
+        pattern's assessment rules (modifiers, negation, '!' boost) over a
+        single precompiled regex tokenizer.
+
+        Tolerance: tokenization differs from pattern's find_tokens only for
+        abbreviations and emoticons glued to surrounding words.
+        On the bundled review samples and synthetic lyrics, 99%+ of texts
+        match TextBlob within 1e-9 and all within 0.05 (see
+        benchmarks/bench_polarity.py).
+        """
+        from textblob.en import sentiment as pattern_sentiment
+        from textblob._text import EMOTICONS
+
+        if dict.__len__(pattern_sentiment) == 0:
+            pattern_sentiment.load()
+
+        self.lexicon = {}
+        modifiers = set()
+        for word, by_pos in dict.items(pattern_sentiment):
+            self.lexicon[word] = tuple(by_pos[None])
+            if 'RB' in by_pos:
+                modifiers.add(word)
+        self.modifiers = frozenset(modifiers)
+
+        self.emoticons = {}
+        for (_, polarity), faces in EMOTICONS.items():
+            for face in faces:
+                self.emoticons.setdefault(face.lower(), polarity)
+
+        # Non-alphabetic emoticons and the '(!)' sarcasm mark are matched before
+        # words, since pattern re-joins them after splitting punctuation
+        faces = sorted((face for face in self.emoticons if not face.isalpha()), key=len, reverse=True)
+        emoticon_pattern = '|'.join(re.escape(face) for face in faces)
+        self.token_pattern = re.compile(
+            rf"(?:{SARCASM_PATTERN}|{emoticon_pattern})(?![^\s{_P}])|{WORD_PATTERN}"
+        )
+
+    def tokenize(self, text):
+        """Lowercased tokens in the order pattern's sentiment scorer sees them"""
+        text = QUOTES.sub(' ', text.lower().replace("n't", " n't"))
+        return self.token_pattern.findall(text)
+
+    def score(self, text):
+        """Return (polarity, subjectivity) for one text"""
+        if not isinstance(text, str):
+            return 0.0, 0.0
+        lexicon = self.lexicon
+        modifiers = self.modifiers
+        # Each assessment: [polarity, subjectivity, intensity, negated]
+        a = []
+        m = None
+        n = None
+        for w in self.tokenize(text):
+            scores = lexicon.get(w)
+            if scores is not None:
+                p, s, i = scores
+                if m is None:
+                    a.append([p, s, i, False])
+                else:
+                    last = a[-1]
+                    last[0] = max(-1.0, min(p * last[2], 1.0))
+                    last[1] = max(-1.0, min(s * last[2], 1.0))
+                    last[2] = i
+                if n is not None:
+                    a[-1][2] = 1.0 / a[-1][2]
+                    a[-1][3] = True
+                m = w if w in modifiers else None
+                n = w if w in NEGATIONS else None
+            else:
+                if w[0] == '(' and w[-1] == ')' and '!' in w:
+                    w = '(!)'
+                if w in NEGATIONS:
+                    n = w
+                elif n and len(w) > 1:
+                    n = None
+                if n is not None and m is not None and m.endswith('ly'):
+                    a[-1][3] = True
+                    n = None
+                elif m and len(w) > 2:
+                    m = None
+                if w == '!' and a:
+                    a[-1][0] = max(-1.0, min(a[-1][0] * 1.25, 1.0))
+                if w == '(!)':
+                    a.append([0.0, 1.0, 1.0, False])
+                if len(w) <= 5 and not w.isalpha():
+                    polarity = self.emoticons.get(w)
+                    if polarity is not None:
+                        a.append([polarity, 1.0, 1.0, False])
+        if not a:
+            return 0.0, 0.0
+        polarity = sum(p * -0.5 if negated else p for p, _, _, negated in a) / len(a)
+        subjectivity = sum(s for _, s, _, _ in a) / len(a)
+        return polarity, subjectivity
+
+    def score_batch(self, texts):
+        """Return a float64 array of shape (n_texts, 2): polarity, subjectivity"""
+        scores = np.zeros((len(texts), 2), dtype=np.float64)
+        for row, text in enumerate(texts):
+            scores[row] = self.score(text)
+        return scores
+
+
+_shared_scorer = None
+
+
+def get_lexicon_sentiment():
+    """Shared LexiconSentiment, built once per process"""
+    global _shared_scorer
+    if _shared_scorer is None:
+        _shared_scorer = LexiconSentiment()
+    return _shared_scorer
@@ -0,0 +1,160 @@
+"""
+Feature pipeline shared by HitPredictor training and serving
+Fitted once on the raw training DataFrame and saved with the model, so
+predictions see exactly the features the forest was trained on: numeric
+columns are standardized with the stored mean/scale and object columns are
+one-hot encoded against their stored vocabularies (unknown categories give
+all zeros, like OneHotEncoder(handle_unknown='ignore')). Serving only does
+array arithmetic and sorted-vocabulary lookups; no sklearn transformer is
+refitted or even imported.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+FEATURE_PIPELINE_VERSION = 1
+FEATURE_PIPELINE_FILE = 'feature_pipeline.json'
+
+# Numeric columns LyricAnalyzer adds to analyzed DataFrames
+LYRIC_FEATURE_PREFIXES = ('sentiment_', 'textblob_', 'theme_')
+LYRIC_FEATURE_COLUMNS = ('word_count', 'unique_words')
+
+
+def is_lyric_feature(column):
+    """True for columns computed from lyrics by LyricAnalyzer"""
+    return column.startswith(LYRIC_FEATURE_PREFIXES) or column in LYRIC_FEATURE_COLUMNS
+
+
+class FeaturePipeline:
+    def __init__(self, numeric_columns, categorical_columns, vocabularies, mean, scale,
+                 lyric_columns=None):
+        """
+        Args:
+            numeric_columns: input columns standardized into the first outputs, in order
+            categorical_columns: input columns one-hot encoded after them, in order
+            vocabularies: dict column -> known categories (stored sorted)
+            mean, scale: standardization parameters aligned with numeric_columns
+            lyric_columns: numeric columns that come from lyric analysis
+                (defaults to those named like LyricAnalyzer features)
+        """
+        self.numeric_columns = list(numeric_columns)
+        self.categorical_columns = list(categorical_columns)
+        self.vocabularies = {
+            column: np.array(sorted(vocabularies[column]), dtype=str)
+            for column in self.categorical_columns
+        }
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        if lyric_columns is None:
+            lyric_columns = [column for column in self.numeric_columns if is_lyric_feature(column)]
+        self.lyric_columns = list(lyric_columns)
+
+        # Output column where each categorical block starts
+        self.offsets = np.cumsum(
+            [len(self.numeric_columns)] + [len(self.vocabularies[c]) for c in self.categorical_columns]
+        )
+        self.n_features = int(self.offsets[-1])
+        self.feature_names = self.numeric_columns + [
+            f'{column}={category}'
+            for column in self.categorical_columns
+            for category in self.vocabularies[column]
+        ]
+
+    @classmethod
+    def fit(cls, X, lyric_columns=None):
+        """
+        Fit on a raw feature DataFrame: object columns are categorical,
+        everything else numeric
+        """
+        categorical_columns = list(X.select_dtypes(include=['object']).columns)
+        numeric_columns = list(X.select_dtypes(exclude=['object']).columns)
+
+        values = X[numeric_columns].to_numpy(dtype=np.float64)
+        mean = np.nanmean(values, axis=0) if len(values) else np.zeros(len(numeric_columns))
+        scale = np.nanstd(values, axis=0) if len(values) else np.ones(len(numeric_columns))
+        # Constant columns are left unscaled, as StandardScaler does
+        scale[~(scale > 10 * np.finfo(np.float64).eps)] = 1.0
+
+        vocabularies = {column: np.unique(X[column].astype(str)) for column in categorical_columns}
+        return cls(numeric_columns, categorical_columns, vocabularies, mean, scale, lyric_columns)
+
+    def transform(self, X):
+        """
+        Model input rows for raw features
+        Args:
+            X: DataFrame, one song as a dict, or a list of such dicts
+        Returns:
+            float64 array of shape (n_rows, n_features)
+        """
+        columns, n_rows = self._columns(X)
+        missing = [c for c in self.numeric_columns + self.categorical_columns if c not in columns]
+        if missing:
+            raise ValueError(f"Missing feature columns: {missing}")
+
+        out = np.zeros((n_rows, self.n_features), dtype=np.float64)
+        if self.numeric_columns:
+            if isinstance(columns, pd.DataFrame):
+                numeric = columns[self.numeric_columns].to_numpy(dtype=np.float64)
+            else:
+                numeric = np.column_stack([
+                    np.asarray(columns[c], dtype=np.float64) for c in self.numeric_columns
+                ])
+            out[:, :len(self.numeric_columns)] = (numeric - self.mean) / self.scale
+
+        rows = np.arange(n_rows)
+        for column, offset in zip(self.categorical_columns, self.offsets):
+            vocabulary = self.vocabularies[column]
+            if not len(vocabulary):
+                continue
+            values = np.asarray(columns[column], dtype=object).astype(str)
+            index = np.minimum(np.searchsorted(vocabulary, values), len(vocabulary) - 1)
+            known = vocabulary[index] == values
+            out[rows[known], offset + index[known]] = 1.0
+        return out
+
+    @staticmethod
+    def _columns(X):
+        """(column -> values, n_rows) for a DataFrame, dict or list of dicts"""
+        if isinstance(X, pd.DataFrame):
+            return X, len(X)
+        if isinstance(X, dict):
+            return {column: [value] for column, value in X.items()}, 1
+        rows = list(X)
+        names = set().union(*rows) if rows else set()
+        return {name: [row.get(name) for row in rows] for name in names}, len(rows)
+
+    def to_dict(self):
+        """JSON-serializable form (floats round-trip exactly)"""
+        return {
+            'version': FEATURE_PIPELINE_VERSION,
+            'numeric_columns': self.numeric_columns,
+            'categorical_columns': self.categorical_columns,
+            'vocabularies': {c: self.vocabularies[c].tolist() for c in self.categorical_columns},
+            'mean': self.mean.tolist(),
+            'scale': self.scale.tolist(),
+            'lyric_columns': self.lyric_columns,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of to_dict"""
+        if data.get('version') != FEATURE_PIPELINE_VERSION:
+            raise ValueError(f"Unsupported feature pipeline version {data.get('version')}")
+        return cls(data['numeric_columns'], data['categorical_columns'], data['vocabularies'],
+                   data['mean'], data['scale'], data['lyric_columns'])
+
+    def save(self, path):
+        """Write feature_pipeline.json into directory path (swapped in atomically)"""
+        os.makedirs(path, exist_ok=True)
+        tmp_path = os.path.join(path, f'{FEATURE_PIPELINE_FILE}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, os.path.join(path, FEATURE_PIPELINE_FILE))
+
+    @classmethod
+    def load(cls, path):
+        """Read feature_pipeline.json from directory path"""
+        with open(os.path.join(path, FEATURE_PIPELINE_FILE)) as f:
+            return cls.from_dict(json.load(f))
@@ -1,19 +1,83 @@
 import pandas as pd
-from textblob import TextBlob
-from nltk.sentiment import SentimentIntensityAnalyzer
-import nltk
-from nltk.corpus import stopwords
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from importlib.metadata import version
+import hashlib
+import json
+import math
+import os
 import re
+import numpy as np
+from modules.analysis_cache import AnalysisCache
+from modules.corpus_aggregation import extract_terms, top_terms
+from modules.fast_sentiment import get_lexicon_sentiment
+from modules.nltk_resources import get_stopwords, get_vader
+from modules.tokenizer import alpha_words, count_words
+from modules.theme_matcher import (
+    ThemeMatcher, PhraseThemeMatcher, SparseThemeScorer, load_theme_lexicon, has_phrases, has_weights
+)
+
+# Bump when the feature computation changes so cached results are invalidated
+ANALYZER_VERSION = '3'
+
+# Compact dtypes for the feature columns of analyzed DataFrames
+SCORE_DTYPE = np.float32
+FLAG_DTYPE = np.uint8
+COUNT_DTYPE = np.uint32
+
+# Genius-style section headers such as "[Chorus]" or "[Verse 2: Artist]"
+SECTION_HEADER = re.compile(r'^\[(.+?)\]$')
+
+# Per-process analyzer used by the parallel batch mode
+_worker_analyzer = None
+
+
+def _init_worker(options):
+    """Build one analyzer (VADER, lexicons, theme index) per worker process"""
+    global _worker_analyzer
+    _worker_analyzer = LyricAnalyzer(**options)
+
+
+def _analyze_chunk(chunk):
+    """Analyze one DataFrame chunk inside a worker process"""
+    return _worker_analyzer._analyze_dataframe(chunk)
 
-nltk.download('stopwords')
-nltk.download('vader_lexicon')
 
 class LyricAnalyzer:
-    def __init__(self):
-        """Initialize analyzer with sentiment tools and expanded theme keywords"""
-        self.sia = SentimentIntensityAnalyzer()
-        self.stop_words = set(stopwords.words('english'))
+    def __init__(self, theme_counts=False, cache=None, theme_backend=None,
+                 polarity_backend='textblob', corpus_stats=None, theme_lexicon=None):
+        """
+        Initialize analyzer with sentiment tools and expanded theme keywords
+        Args:
+            theme_counts: also emit 'theme_<name>_hits' keyword counts per theme
+            cache: optional AnalysisCache for per-song results (not shared
+                with parallel workers)
+            theme_backend: 'index' (per-song inverted index, single words only),
+                'automaton' (Aho-Corasick over words and phrases) or 'sparse'
+                (batch document-term matmul, adds 'theme_<name>_score' when
+                the lexicon has keyword weights); None picks 'automaton' if
+                the lexicon has phrases, else 'index'
+            polarity_backend: 'textblob' or 'lexicon' (LexiconSentiment, same
+                scores within 0.05 at several times the throughput)
+            corpus_stats: optional CorpusStats updated with every analyzed
+                song; enables get_tfidf
+            theme_lexicon: optional JSON lexicon path (or dict) mapping theme
+                name -> words/phrases (or words/phrases -> weight), replacing
+                the built-in themes
+        """
+        if theme_backend not in (None, 'index', 'automaton', 'sparse'):
+            raise ValueError("theme_backend must be 'index', 'automaton' or 'sparse'")
+        if polarity_backend not in ('textblob', 'lexicon'):
+            raise ValueError("polarity_backend must be 'textblob' or 'lexicon'")
+        self.theme_counts = theme_counts
+        self.polarity_backend = polarity_backend
+        self.cache = cache
+        self.corpus_stats = corpus_stats
+        self.options = {
+            'theme_counts': theme_counts,
+            'polarity_backend': polarity_backend
+        }
         self.theme_keywords = {
             'love': ['love', 'heart', 'baby', 'kiss', 'hold', 'touch', 'darling', 'sweet'],
             'party': ['party', 'dance', 'night', 'club', 'fun', 'drink', 'celebrate', 'dj', 'music'],
@@ -31,46 +95,284 @@ class LyricAnalyzer:
             'fame': ['fame', 'spotlight', 'stage', 'fans', 'star', 'show', 'interview'],
             'freedom': ['free', 'fly', 'escape', 'run', 'break', 'chains'],
         }
+        if theme_lexicon is not None:
+            if isinstance(theme_lexicon, str):
+                theme_lexicon = load_theme_lexicon(theme_lexicon)
+            self.theme_keywords = theme_lexicon
+            # Workers get the loaded lexicon rather than re-reading the file
+            self.options['theme_lexicon'] = theme_lexicon
+        phrases = has_phrases(self.theme_keywords)
+        if theme_backend is None:
+            theme_backend = 'automaton' if phrases else 'index'
+        elif theme_backend == 'index' and phrases:
+            raise ValueError("Theme lexicon has phrases; use theme_backend='automaton' or 'sparse'")
+        self.theme_backend = theme_backend
+        self.options['theme_backend'] = theme_backend
+        # _detect_theme uses the per-song matcher with every backend
+        if theme_backend == 'automaton' or phrases:
+            self.theme_matcher = PhraseThemeMatcher(self.theme_keywords)
+        else:
+            self.theme_matcher = ThemeMatcher(self.theme_keywords)
+        self.theme_scorer = None
+        if theme_backend == 'sparse':
+            self.theme_scorer = SparseThemeScorer(self.theme_keywords)
+        # Without weights a theme score is just its hit count
+        self.theme_scores = theme_backend == 'sparse' and has_weights(self.theme_keywords)
+        self._version = None
+
+    @property
+    def sia(self):
+        """VADER analyzer, loaded from local NLTK data on first use"""
+        return get_vader()
 
-    def analyze(self, input_data):
+    @property
+    def stop_words(self):
+        """English stopwords, loaded from local NLTK data on first use"""
+        return get_stopwords()
+
+    @property
+    def version(self):
+        """Cache fingerprint, computed on first use (needs the VADER lexicon)"""
+        if self._version is None:
+            self._version = self._get_version()
+        return self._version
+
+    def analyze(self, input_data, n_jobs=1, chunk_size=None, as_arrow=False):
         """
         Main analysis method that handles both DataFrames and single songs
         Args:
             input_data: Can be either:
                 - pandas DataFrame (must contain 'lyrics' column)
                 - dictionary with 'lyrics' key
+            n_jobs: worker processes for DataFrames (-1 = all cores, 1 = serial)
+            chunk_size: rows per worker task (default: ~4 chunks per worker)
+            as_arrow: return a pyarrow.Table instead of a DataFrame
         Returns:
             Analysis results in the same format as input
         """
         if isinstance(input_data, pd.DataFrame):
-            return self._analyze_dataframe(input_data)
+            if n_jobs != 1:
+                result = self._analyze_parallel(input_data, n_jobs, chunk_size)
+                return self._to_arrow(result) if as_arrow else result
+            return self._analyze_dataframe(input_data, as_arrow=as_arrow)
         elif isinstance(input_data, dict):
             return self._analyze_single_song(input_data)
         else:
             raise ValueError("Input must be DataFrame or dictionary")
 
-    def _analyze_dataframe(self, df):
+    def analyze_iter(self, source, chunk_size=1000, as_arrow=False):
+        """
+        Stream analysis chunk by chunk so memory scales with chunk_size
+        Args:
+            source: Can be either:
+                - path to a .csv / .csv.gz / .parquet file (read in chunks)
+                - iterable of song dictionaries with 'lyrics' key
+                - iterable of DataFrames (e.g. pd.read_csv(..., chunksize=n))
+                - pandas DataFrame (analyzed in row slices)
+            chunk_size: rows per yielded chunk
+            as_arrow: yield pyarrow.Table chunks instead of DataFrames
+        Yields:
+            Analyzed DataFrame chunks in input order
+        """
+        for chunk in self._iter_chunks(source, chunk_size):
+            yield self._analyze_dataframe(chunk, as_arrow=as_arrow)
+
+    def analyze_lines(self, lyrics, level='line', memo=None):
+        """
+        Per-line (or per-section) sentiment trajectory of one song
+        Args:
+            lyrics: lyrics string; sections are split on blank lines and
+                "[Chorus]"-style headers
+            level: 'line' for one row per lyric line, 'section' for mean
+                scores per section
+            memo: optional dict shared across songs; each distinct line is
+                scored once per memo (a fresh memo is used per song otherwise)
+        Returns:
+            DataFrame with line_no, section, section_label, line and the
+            five sentiment columns (level='section' adds n_lines)
+        """
+        if level not in ('line', 'section'):
+            raise ValueError("level must be 'line' or 'section'")
+        score_columns = list(self._get_empty_sentiment())
+        columns = ['line_no', 'section', 'section_label', 'line'] + score_columns
+        memo = {} if memo is None else memo
+        
+        rows = []
+        section, label, section_has_lines = 0, None, False
+        for line in (lyrics.splitlines() if isinstance(lyrics, str) else []):
+            line = line.strip()
+            header = SECTION_HEADER.match(line)
+            if header or not line:
+                # A header or blank line closes the current section
+                if section_has_lines:
+                    section += 1
+                    label, section_has_lines = None, False
+                if header:
+                    label = header.group(1)
+                continue
+            
+            scores = memo.get(line)
+            if scores is None:
+                scores = memo[line] = self._get_sentiment(line)
+            rows.append({
+                'line_no': len(rows),
+                'section': section,
+                'section_label': label or f'Section {section + 1}',
+                'line': line,
+                **scores
+            })
+            section_has_lines = True
+        
+        lines = pd.DataFrame(rows, columns=columns)
+        if level == 'line':
+            return lines
+        grouped = lines.groupby(['section', 'section_label'], sort=False)
+        sections = grouped[score_columns].mean()
+        sections.insert(0, 'n_lines', grouped.size())
+        return sections.reset_index()
+
+    def analyze_lines_batch(self, df, level='line', shared_memo=True):
+        """
+        Line/section sentiment for every song in a DataFrame
+        With shared_memo, a line repeated across songs is scored only once.
+        Returns:
+            analyze_lines output for all songs, with a leading 'song' column
+            holding the DataFrame index
+        """
+        if 'lyrics' not in df.columns:
+            raise ValueError("DataFrame must contain 'lyrics' column")
+        memo = {} if shared_memo else None
+        frames = []
+        for song, lyrics in df['lyrics'].items():
+            lines = self.analyze_lines(lyrics, level=level, memo=memo)
+            lines.insert(0, 'song', song)
+            frames.append(lines)
+        if not frames:
+            return self.analyze_lines(None, level=level).assign(song=None)
+        return pd.concat(frames, ignore_index=True)
+
+    def _iter_chunks(self, source, chunk_size):
+        """Turn any supported streaming source into DataFrame chunks"""
+        if isinstance(source, (str, os.PathLike)):
+            path = os.fspath(source)
+            if path.endswith(('.csv', '.csv.gz')):
+                yield from pd.read_csv(path, chunksize=chunk_size)
+            elif path.endswith('.parquet'):
+                import pyarrow.parquet as pq
+                for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+                    yield batch.to_pandas()
+            else:
+                raise ValueError("File source must be .csv, .csv.gz or .parquet")
+            return
+        
+        if isinstance(source, pd.DataFrame):
+            for start in range(0, len(source), chunk_size):
+                yield source.iloc[start:start + chunk_size]
+            return
+        
+        songs = []
+        for item in source:
+            if isinstance(item, dict):
+                songs.append(item)
+                if len(songs) >= chunk_size:
+                    yield pd.DataFrame(songs)
+                    songs = []
+                continue
+            
+            if songs:
+                yield pd.DataFrame(songs)
+                songs = []
+            if isinstance(item, pd.DataFrame):
+                yield item
+            elif hasattr(item, 'to_pandas'):
+                # pyarrow RecordBatch / Table
+                yield item.to_pandas()
+            else:
+                raise ValueError("Stream items must be dictionaries or DataFrames")
+        if songs:
+            yield pd.DataFrame(songs)
+
+    def _analyze_dataframe(self, df, as_arrow=False):
         """Analyze lyrics in a DataFrame"""
         if 'lyrics' not in df.columns:
             raise ValueError("DataFrame must contain 'lyrics' column")
         
-        df = df.copy()
+        lyrics = df['lyrics'].tolist()
+        self._update_corpus_stats(lyrics)
+        columns = self._allocate_feature_columns(len(lyrics))
+        
+        # Sentiment and text statistics per song (cached when enabled, with
+        # one cache commit for the whole batch)
+        text_columns = [columns[name] for name in self._get_empty_text_features()]
+        with self.cache.batch() if self.cache is not None else nullcontext():
+            for row, text in enumerate(lyrics):
+                if isinstance(text, str):
+                    for column, value in zip(text_columns, self._get_text_features(text).values()):
+                        column[row] = value
+        
+        # Theme Detection for the whole batch
+        flags, hits, scores = self._detect_theme_arrays(lyrics)
+        for i, theme in enumerate(self.theme_keywords):
+            columns[f'theme_{theme}'] = flags[:, i]
+            if self.theme_counts:
+                columns[f'theme_{theme}_hits'] = hits[:, i]
+            if scores is not None:
+                columns[f'theme_{theme}_score'] = scores[:, i]
+        
+        if as_arrow:
+            import pyarrow as pa
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            for name, values in columns.items():
+                table = table.append_column(name, pa.array(values))
+            return table
+        
+        # Attach every feature column in a single concat
+        features = pd.DataFrame(columns, index=df.index, copy=False)
+        return pd.concat([df, features], axis=1)
+
+    def _allocate_feature_columns(self, n_rows):
+        """Zero-filled arrays (compact dtypes) for every feature column, in output order"""
+        columns = {}
+        for name in self._get_feature_columns():
+            if name.startswith(('sentiment_', 'textblob_')) or name.endswith('_score'):
+                dtype = SCORE_DTYPE
+            elif name.startswith('theme_') and not name.endswith('_hits'):
+                dtype = FLAG_DTYPE
+            else:
+                dtype = COUNT_DTYPE
+            columns[name] = np.zeros(n_rows, dtype=dtype)
+        return columns
+
+    def _to_arrow(self, df):
+        """Convert an analyzed DataFrame to a pyarrow.Table"""
+        import pyarrow as pa
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+    def _analyze_parallel(self, df, n_jobs, chunk_size=None):
+        """Analyze DataFrame chunks in a process pool, preserving row order"""
+        if 'lyrics' not in df.columns:
+            raise ValueError("DataFrame must contain 'lyrics' column")
         
-        # Sentiment Analysis
-        sentiment = df['lyrics'].apply(self._get_sentiment)
-        df = pd.concat([df, pd.DataFrame(sentiment.tolist(), index=df.index)], axis=1)
+        if n_jobs is None or n_jobs < 1:
+            n_jobs = os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(df) / (n_jobs * 4)))
         
-        # Theme Detection
-        for theme in self.theme_keywords:
-            df[f'theme_{theme}'] = df['lyrics'].apply(
-                lambda x: self._detect_theme(x, theme)
-            ).astype(int)
+        chunks = [df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size)]
+        if n_jobs == 1 or len(chunks) <= 1:
+            return self._analyze_dataframe(df)
         
-        # Text Statistics
-        df['word_count'] = df['lyrics'].apply(self._count_words)
-        df['unique_words'] = df['lyrics'].apply(self._count_unique_words)
+        with ProcessPoolExecutor(
+            max_workers=min(n_jobs, len(chunks)),
+            initializer=_init_worker,
+            initargs=(self.options,)
+        ) as pool:
+            # map() yields results in submission order
+            results = list(pool.map(_analyze_chunk, chunks))
         
-        return df
+        # Workers have no corpus statistics store; update it here
+        self._update_corpus_stats(df['lyrics'].tolist())
+        return pd.concat(results)
 
     def _analyze_single_song(self, song_data):
         """Analyze a single song dictionary"""
@@ -78,45 +380,121 @@ class LyricAnalyzer:
             return {**song_data, **self._get_empty_analysis()}
         
         lyrics = song_data['lyrics']
-        result = {
+        self._update_corpus_stats([lyrics])
+        return {
             **song_data,
+            **self._get_text_features(lyrics),
+            **self._detect_themes(lyrics)
+        }
+
+    def _update_corpus_stats(self, lyrics):
+        """Record document frequencies of newly seen songs"""
+        if self.corpus_stats is None:
+            return
+        self.corpus_stats.add_documents(
+            (text, self._tokenize_terms(text)) for text in lyrics if isinstance(text, str)
+        )
+
+    def _tokenize_terms(self, text):
+        """Lowercased alphabetic non-stopword tokens (same as get_top_words)"""
+        return extract_terms(text, self.stop_words, ngram_range=(1, 1))
+
+    def get_tfidf(self, lyrics, n=10):
+        """Top-n (term, weight) TF-IDF pairs for one song against the corpus statistics"""
+        if self.corpus_stats is None:
+            raise ValueError("TF-IDF requires a CorpusStats store (corpus_stats=...)")
+        if not isinstance(lyrics, str):
+            return []
+        weights = self.corpus_stats.tfidf(self._tokenize_terms(lyrics))
+        return sorted(weights.items(), key=lambda item: item[1], reverse=True)[:n]
+
+    def _get_text_features(self, lyrics):
+        """Sentiment scores and word counts for one song, using the cache if set"""
+        if not isinstance(lyrics, str):
+            return self._get_empty_text_features()
+        
+        if self.cache is not None:
+            key = AnalysisCache.make_key(lyrics, self.version)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        result = {
             **self._get_sentiment(lyrics),
             'word_count': self._count_words(lyrics),
             'unique_words': self._count_unique_words(lyrics)
         }
         
-        # Add theme detection
-        for theme in self.theme_keywords:
-            result[f'theme_{theme}'] = self._detect_theme(lyrics, theme)
-            
+        if self.cache is not None:
+            self.cache.put(key, result)
         return result
 
+    def _get_version(self):
+        """Fingerprint of analyzer code, options, lexicons and library versions"""
+        payload = json.dumps({
+            'analyzer': ANALYZER_VERSION,
+            'options': self.options,
+            'themes': self.theme_keywords,
+            'vader_lexicon_size': len(self.sia.lexicon),
+            'nltk': version('nltk'),
+            'textblob': version('textblob')
+        }, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _get_feature_columns(self):
+        """Names of the feature columns added to analyzed DataFrames"""
+        return list(self._get_empty_analysis())
+
+    def _get_theme_columns(self):
+        """Names of the theme columns for the configured backend/options"""
+        columns = [f'theme_{theme}' for theme in self.theme_keywords]
+        if self.theme_counts:
+            columns += [f'theme_{theme}_hits' for theme in self.theme_keywords]
+        if self.theme_scores:
+            columns += [f'theme_{theme}_score' for theme in self.theme_keywords]
+        return columns
+
     def _get_sentiment(self, text):
         """Get comprehensive sentiment scores"""
         if not isinstance(text, str):
             return self._get_empty_sentiment()
         
         vader = self.sia.polarity_scores(text)
-        blob = TextBlob(text)
+        polarity, subjectivity = self._get_polarity(text)
         
         return {
             'sentiment_compound': vader['compound'],
             'sentiment_positive': vader['pos'],
             'sentiment_negative': vader['neg'],
-            'textblob_polarity': blob.sentiment.polarity,
-            'textblob_subjectivity': blob.sentiment.subjectivity
+            'textblob_polarity': polarity,
+            'textblob_subjectivity': subjectivity
         }
 
+    def _get_polarity(self, text):
+        """TextBlob-style (polarity, subjectivity) from the configured backend"""
+        if self.polarity_backend == 'lexicon':
+            return get_lexicon_sentiment().score(text)
+        
+        from textblob import TextBlob
+        sentiment = TextBlob(text).sentiment
+        return sentiment.polarity, sentiment.subjectivity
+
     def _get_empty_analysis(self):
         """Return empty analysis structure"""
-        empty = {
+        empty = self._get_empty_sentiment()
+        for column in self._get_theme_columns():
+            empty[column] = 0
+        empty['word_count'] = 0
+        empty['unique_words'] = 0
+        return empty
+
+    def _get_empty_text_features(self):
+        """Return empty sentiment and word count structure"""
+        return {
             **self._get_empty_sentiment(),
             'word_count': 0,
             'unique_words': 0
         }
-        for theme in self.theme_keywords:
-            empty[f'theme_{theme}'] = 0
-        return empty
 
     def _get_empty_sentiment(self):
         """Return empty sentiment structure"""
@@ -128,31 +506,101 @@ class LyricAnalyzer:
             'textblob_subjectivity': 0
         }
 
+    def _detect_themes(self, text):
+        """Detect all themes (and optionally hit counts) in a single pass"""
+        if self.theme_backend == 'sparse':
+            flags, hits, scores = self._detect_theme_arrays([text])
+            result = {f'theme_{theme}': int(flags[0, i]) for i, theme in enumerate(self.theme_keywords)}
+            if self.theme_counts:
+                for i, theme in enumerate(self.theme_keywords):
+                    result[f'theme_{theme}_hits'] = int(hits[0, i])
+            if scores is not None:
+                for i, theme in enumerate(self.theme_keywords):
+                    result[f'theme_{theme}_score'] = float(scores[0, i])
+            return result
+        if self.theme_counts:
+            return self.theme_matcher.match_with_counts(text)
+        return self.theme_matcher.match(text)
+
+    def _detect_theme_arrays(self, lyrics):
+        """
+        Detect themes for a list of lyrics
+        Returns:
+            (flags, hits, scores) arrays of shape (n_songs, n_themes); scores is
+            None unless the sparse backend is used with a weighted lexicon
+        """
+        if self.theme_backend == 'sparse':
+            flags, hits, scores = self.theme_scorer.match(lyrics)
+            scores = scores.astype(SCORE_DTYPE) if self.theme_scores else None
+            return flags.astype(FLAG_DTYPE), hits.astype(COUNT_DTYPE), scores
+        
+        hits = np.zeros((len(lyrics), len(self.theme_keywords)), dtype=COUNT_DTYPE)
+        for row, text in enumerate(lyrics):
+            if isinstance(text, str):
+                hits[row] = self.theme_matcher.count(text)
+        return (hits > 0).astype(FLAG_DTYPE), hits, None
+
     def _detect_theme(self, text, theme):
         """Detect if lyrics contain theme keywords"""
         if not isinstance(text, str) or theme not in self.theme_keywords:
             return 0
-        words = re.findall(r'\w+', text.lower())
-        return int(any(keyword in words for keyword in self.theme_keywords[theme]))
+        return self.theme_matcher.match(text)[f'theme_{theme}']
 
     def _count_words(self, text):
         """Count total words in lyrics"""
-        return len(text.split()) if isinstance(text, str) else 0
+        return count_words(text)
 
     def _count_unique_words(self, text):
         """Count unique words in lyrics"""
-        if not isinstance(text, str):
-            return 0
-        return len(set(word.lower() for word in text.split() if word.isalpha()))
+        return len(set(alpha_words(text)))
 
     def get_top_words(self, lyrics, n=10):
         """Get most frequent non-stopwords"""
         if not isinstance(lyrics, str):
             return []
-        words = [word.lower() for word in lyrics.split() 
-                if word.lower() not in self.stop_words and word.isalpha()]
+        words = [word for word in alpha_words(lyrics) if word not in self.stop_words]
         return [word for word, count in Counter(words).most_common(n)]
 
+    def get_corpus_top_words(self, df, group_by=None, n=10, ngram_range=(1, 2),
+                             max_counters=None, n_jobs=1, chunk_size=None):
+        """
+        Most frequent non-stopword unigrams/n-grams per group across a corpus
+        Args:
+            df: DataFrame with a 'lyrics' column
+            group_by: None (whole corpus), a column name such as 'genre' or
+                'artist', or 'theme' (songs count towards every detected theme)
+            n: terms per group
+            ngram_range: (min_n, max_n) word n-gram sizes
+            max_counters: bound memory per group with a Misra-Gries summary
+            n_jobs: worker processes (-1 = all cores)
+            chunk_size: songs per map task
+        Returns:
+            DataFrame with columns <group_by or 'group'>, rank, term, count
+        """
+        if 'lyrics' not in df.columns:
+            raise ValueError("DataFrame must contain 'lyrics' column")
+        
+        lyrics = df['lyrics'].tolist()
+        if group_by is None:
+            groups = [['all']] * len(lyrics)
+        elif group_by == 'theme':
+            themes = list(self.theme_keywords)
+            if all(f'theme_{theme}' in df.columns for theme in themes):
+                flags = df[[f'theme_{theme}' for theme in themes]].to_numpy()
+            else:
+                flags, _, _ = self._detect_theme_arrays(lyrics)
+            groups = [[themes[i] for i in row.nonzero()[0]] for row in flags]
+        elif group_by in df.columns:
+            groups = [[value] for value in df[group_by].tolist()]
+        else:
+            raise ValueError(f"Unknown group_by column '{group_by}'")
+        
+        result = top_terms(
+            groups, lyrics, self.stop_words, k=n, ngram_range=ngram_range,
+            max_counters=max_counters, n_jobs=n_jobs, chunk_size=chunk_size
+        )
+        return result.rename(columns={'group': group_by or 'group'})
+
 # import pandas as pd
 # from textblob import TextBlob
 # from nltk.sentiment import SentimentIntensityAnalyzer
@@ -0,0 +1,260 @@
+"""
+Memory-mappable HitPredictor artifacts
+An artifact is a directory of .npy arrays (forest nodes, leaf values, scaler
+parameters) plus a small meta.json. Loading with mmap=True maps the arrays
+read-only, so every worker process shares one copy of the forest through the
+page cache instead of unpickling a private one.
+Usage (from Backend/): python -m modules.model_artifact data/models/hit_predictor.pkl
+converts an existing pickled model next to the pickle.
+"""
+import json
+import os
+import pickle
+import sys
+
+import numpy as np
+
+ARTIFACT_VERSION = 3
+
+# Per-node arrays (all trees concatenated) and model-level arrays
+_ARRAYS = ('feature', 'threshold', 'children', 'missing_left', 'value', 'roots',
+           'scaler_mean', 'scaler_scale')
+
+# (sample, tree) pairs traversed together; keeps the working set in cache
+_BLOCK_SIZE = 65_536
+
+
+def artifact_path_for(model_path):
+    """Artifact directory stored next to a pickled model: foo.pkl -> foo/"""
+    return os.path.splitext(model_path)[0]
+
+
+class ModelArtifact:
+    def __init__(self, arrays, meta):
+        """
+        Flat NumPy form of a fitted scaler + RandomForestClassifier
+        Args:
+            arrays: dict of the arrays named in _ARRAYS; children is
+                (n_nodes, 2) with the right child first and global node
+                indices (tree offsets applied); leaves are their own children;
+                missing_left marks the nodes that send NaN to the left child
+            meta: dict with classes, n_features, max_depth and
+                feature_importance
+        """
+        for name in _ARRAYS:
+            setattr(self, name, arrays[name])
+        self.right = self.children[:, 0]
+        self.left = self.children[:, 1]
+        self.meta = meta
+        self.classes = np.array(meta['classes'])
+        self.n_features = meta['n_features']
+        self.max_depth = meta['max_depth']
+        self.feature_importance = (
+            {int(k): v for k, v in meta['feature_importance'].items()}
+            if meta.get('feature_importance') else None
+        )
+        
+        # Computed once here rather than per prediction: global importances
+        # in descending order, and the expected value (mean root value) that
+        # path contributions are measured from
+        self.importance = np.zeros(self.n_features)
+        for index, importance in (self.feature_importance or {}).items():
+            self.importance[index] = importance
+        self.importance_order = np.argsort(-self.importance, kind='stable')
+        self.bias = np.take(self.value, self.roots, axis=0).mean(axis=0)
+
+    @classmethod
+    def from_sklearn(cls, model, scaler=None, feature_importance=None):
+        """
+        Export a fitted RandomForestClassifier and StandardScaler
+        scaler=None (inputs already scaled by the feature pipeline) stores an
+        identity transform.
+        """
+        feature, threshold, children, missing_left, value, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left == -1
+            nodes = np.arange(tree.node_count) + offset
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            children.append(np.column_stack([
+                np.where(is_leaf, nodes, tree.children_right + offset),
+                np.where(is_leaf, nodes, tree.children_left + offset),
+            ]))
+            # Where sklearn sends NaN; trees fitted without missing values
+            # have no such array and compare NaN <= threshold as False (right)
+            missing_left.append(getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count)))
+            # Same normalization DecisionTreeClassifier.predict_proba applies
+            proba = tree.value[:, 0, :].copy()
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            value.append(proba / normalizer)
+            roots.append(offset)
+            offset += tree.node_count
+
+        # Trees compare float32 features against float64 thresholds; rounding
+        # each threshold down to a float32 keeps every comparison identical
+        threshold = np.concatenate(threshold)
+        threshold32 = threshold.astype(np.float32)
+        rounded_up = threshold32 > threshold
+        threshold32[rounded_up] = np.nextafter(threshold32[rounded_up], np.float32(-np.inf))
+
+        n_features = int(model.n_features_in_)
+        arrays = {
+            'feature': np.concatenate(feature).astype(np.int32),
+            'threshold': threshold32,
+            'children': np.concatenate(children).astype(np.int32),
+            'missing_left': np.concatenate(missing_left).astype(bool),
+            'value': np.concatenate(value).astype(np.float64),
+            'roots': np.array(roots, dtype=np.int32),
+            'scaler_mean': (np.asarray(scaler.mean_, dtype=np.float64) if scaler is not None
+                            else np.zeros(n_features)),
+            'scaler_scale': (np.asarray(scaler.scale_, dtype=np.float64) if scaler is not None
+                             else np.ones(n_features)),
+        }
+        meta = {
+            'version': ARTIFACT_VERSION,
+            'classes': model.classes_.tolist(),
+            'n_features': n_features,
+            'max_depth': max(int(estimator.tree_.max_depth) for estimator in model.estimators_),
+            'feature_importance': {str(k): float(v) for k, v in (feature_importance or {}).items()},
+        }
+        return cls(arrays, meta)
+
+    def save(self, path):
+        """Write arrays and meta.json under path (files swapped in atomically)"""
+        os.makedirs(path, exist_ok=True)
+        for name in _ARRAYS:
+            tmp_path = os.path.join(path, f'{name}.npy.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.asarray(getattr(self, name)))
+            os.replace(tmp_path, os.path.join(path, f'{name}.npy'))
+        tmp_path = os.path.join(path, 'meta.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, os.path.join(path, 'meta.json'))
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Open an artifact; arrays are memory-mapped read-only unless mmap=False"""
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('version') != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported model artifact version {meta.get('version')} in {path}")
+        mode = 'r' if mmap else None
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mode) for name in _ARRAYS}
+        return cls(arrays, meta)
+
+    def transform(self, X):
+        """StandardScaler.transform with the stored mean and scale"""
+        return (np.asarray(X, dtype=np.float64) - self.scaler_mean) / self.scaler_scale
+
+    def _blocks(self, X):
+        """Row slices of X (float32, C-ordered) small enough for one traversal block"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        step = max(1, _BLOCK_SIZE // len(self.roots))
+        for start in range(0, X.shape[0], step):
+            yield X[start:start + step]
+
+    def _apply_block(self, X, contributions=None):
+        """
+        Leaves of all trees for a block of rows, as a (n_trees, n_rows) array
+        Every (tree, row) pair descends one level per step; leaves point to
+        themselves, so max_depth steps finish every path without masking.
+        NaN features follow missing_left, as in sklearn.
+        Args:
+            contributions: optional (n_rows * n_features, n_classes) array;
+                each step's change in node value is added to the row's split
+                feature (a leaf's self-step adds zero)
+        """
+        n_rows, n_features = X.shape
+        size = n_rows * len(self.roots)
+        node = np.repeat(self.roots, n_rows)
+        row_offset = np.tile(np.arange(n_rows, dtype=np.int32) * n_features, len(self.roots))
+        X = X.ravel()
+        children = self.children.ravel()
+        feature = np.empty(size, dtype=np.int32)
+        x = np.empty(size, dtype=np.float32)
+        threshold = np.empty(size, dtype=np.float32)
+        go_left = np.empty(size, dtype=bool)
+        missing = np.empty(size, dtype=bool)
+        child = np.empty(size, dtype=np.int32)
+        if contributions is not None:
+            node_value = np.take(self.value, node, axis=0)
+        for _ in range(self.max_depth):
+            np.take(self.feature, node, out=feature, mode='clip')
+            feature += row_offset
+            np.take(X, feature, out=x, mode='clip')
+            np.take(self.threshold, node, out=threshold, mode='clip')
+            np.less_equal(x, threshold, out=go_left)
+            np.isnan(x, out=missing)
+            if missing.any():
+                go_left[missing] = self.missing_left[node[missing]]
+            np.multiply(node, 2, out=child)
+            child += go_left
+            if contributions is None:
+                np.take(children, child, out=node, mode='clip')
+                continue
+            # feature already holds row * n_features + split feature
+            np.take(children, child, out=node, mode='clip')
+            parent_value, node_value = node_value, np.take(self.value, node, axis=0)
+            delta = node_value - parent_value
+            for c in range(delta.shape[1]):
+                contributions[:, c] += np.bincount(feature, weights=delta[:, c], minlength=len(contributions))
+        return node.reshape(len(self.roots), n_rows)
+
+    def apply(self, X):
+        """Leaf index of every (sample, tree): array of shape (n_samples, n_trees)"""
+        blocks = [self._apply_block(block).T for block in self._blocks(X)]
+        if not blocks:
+            return np.empty((0, len(self.roots)), dtype=np.int32)
+        return np.concatenate(blocks)
+
+    def predict_proba(self, X):
+        """Mean of per-tree class probabilities, as RandomForestClassifier computes it"""
+        proba = np.empty((len(X), len(self.classes)), dtype=np.float64)
+        start = 0
+        for block in self._blocks(X):
+            # Summing over the leading tree axis adds trees one at a time, in
+            # order, like the forest does, so the result is bit-identical
+            leaves = self._apply_block(block)
+            proba[start:start + len(block)] = np.take(self.value, leaves, axis=0).sum(axis=0)
+            start += len(block)
+        proba /= len(self.roots)
+        return proba
+
+    def explain(self, X):
+        """
+        Probabilities plus tree-path feature contributions, in one traversal
+        Each split on a path moves the tree's value from parent to child; that
+        change is credited to the split feature and averaged over trees, so
+        bias + contributions.sum(axis=1) equals proba (up to float rounding).
+        Returns:
+            (proba, contributions): shapes (n_samples, n_classes) and
+            (n_samples, n_features, n_classes); the bias is self.bias
+        """
+        X = np.asarray(X)
+        n_classes = len(self.classes)
+        proba = np.empty((len(X), n_classes), dtype=np.float64)
+        contributions = np.empty((len(X), X.shape[1], n_classes), dtype=np.float64)
+        start = 0
+        for block in self._blocks(X):
+            block_contributions = np.zeros((block.size, n_classes), dtype=np.float64)
+            leaves = self._apply_block(block, block_contributions)
+            end = start + len(block)
+            proba[start:end] = np.take(self.value, leaves, axis=0).sum(axis=0)
+            contributions[start:end] = block_contributions.reshape(len(block), X.shape[1], n_classes)
+            start = end
+        proba /= len(self.roots)
+        contributions /= len(self.roots)
+        return proba, contributions
+
+
+if __name__ == "__main__":
+    model_path = sys.argv[1] if len(sys.argv) > 1 else 'data/models/hit_predictor.pkl'
+    with open(model_path, 'rb') as f:
+        data = pickle.load(f)
+    artifact = ModelArtifact.from_sklearn(data['model'], data['scaler'], data.get('feature_importance'))
+    artifact.save(artifact_path_for(model_path))
+    print(f"Wrote model artifact to {artifact_path_for(model_path)}")
@@ -0,0 +1,295 @@
+"""
+Local registry of trained HitPredictor versions, plus hot reload for servers
+Layout under the registry root:
+    versions/v0001/hit_predictor.pkl     pickled model (training, warm start)
+    versions/v0001/hit_predictor/        memory-mappable artifact + feature pipeline
+    versions/v0001/manifest.json         version, creation time, metadata, sha256 per file
+    ACTIVE                               name of the version servers should use
+Versions are written to a temporary directory and renamed into place, and
+ACTIVE is replaced atomically, so readers never see a partial version.
+Usage (from Backend/):
+    python -m modules.model_registry publish data/models/hit_predictor.pkl
+    python -m modules.model_registry list | activate v0002 | verify v0002
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from modules.model_artifact import artifact_path_for
+from modules.prediction import HitPredictor
+
+MODEL_FILE = 'hit_predictor.pkl'
+MANIFEST_FILE = 'manifest.json'
+ACTIVE_FILE = 'ACTIVE'
+
+
+def file_checksum(path):
+    """sha256 hex digest of a file, read in 1 MiB blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    def __init__(self, root='data/models/registry'):
+        """
+        Args:
+            root: registry directory (created on first publish)
+        """
+        self.root = root
+        self.versions_dir = os.path.join(root, 'versions')
+
+    def versions(self):
+        """Published version names, oldest first"""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.versions_dir)
+            if name.startswith('v') and os.path.exists(os.path.join(self.versions_dir, name, MANIFEST_FILE))
+        )
+
+    def version_dir(self, version):
+        return os.path.join(self.versions_dir, version)
+
+    def model_path(self, version):
+        """Path of the pickled model of a version (its artifact sits next to it)"""
+        return os.path.join(self.version_dir(version), MODEL_FILE)
+
+    def manifest(self, version):
+        """Manifest dict of a version"""
+        path = os.path.join(self.version_dir(version), MANIFEST_FILE)
+        if not os.path.exists(path):
+            raise ValueError(f"Unknown model version: {version}")
+        with open(path) as f:
+            return json.load(f)
+
+    def publish(self, model_path, metadata=None, activate=True):
+        """
+        Copy a saved model (pickle + artifact directory) in as a new version
+        Args:
+            model_path: pickle written by HitPredictor.save_model
+            metadata: optional JSON-serializable dict stored in the manifest
+            activate: make the new version the active one
+        Returns:
+            the new version name
+        """
+        os.makedirs(self.versions_dir, exist_ok=True)
+        tmp_dir = os.path.join(self.versions_dir, f'.tmp-{os.getpid()}-{threading.get_ident()}')
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        shutil.copy2(model_path, os.path.join(tmp_dir, MODEL_FILE))
+        artifact_dir = artifact_path_for(model_path)
+        if os.path.isdir(artifact_dir):
+            shutil.copytree(artifact_dir, artifact_path_for(os.path.join(tmp_dir, MODEL_FILE)))
+
+        files = {}
+        for directory, _, names in os.walk(tmp_dir):
+            for name in names:
+                path = os.path.join(directory, name)
+                files[os.path.relpath(path, tmp_dir).replace(os.sep, '/')] = file_checksum(path)
+
+        while True:
+            existing = self.versions()
+            version = f'v{int(existing[-1][1:]) + 1 if existing else 1:04d}'
+            manifest = {
+                'version': version,
+                'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'source': os.path.abspath(model_path),
+                'metadata': metadata or {},
+                'files': dict(sorted(files.items()))
+            }
+            with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w') as f:
+                json.dump(manifest, f, indent=2)
+            try:
+                os.rename(tmp_dir, self.version_dir(version))
+                break
+            except OSError:
+                # Another publisher took this version number
+                if not os.path.exists(self.version_dir(version)):
+                    raise
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def verify(self, version):
+        """Recompute checksums; raises ValueError if any file is missing or changed"""
+        manifest = self.manifest(version)
+        for name, checksum in manifest['files'].items():
+            path = os.path.join(self.version_dir(version), *name.split('/'))
+            if not os.path.exists(path):
+                raise ValueError(f"Model version {version} is missing {name}")
+            if file_checksum(path) != checksum:
+                raise ValueError(f"Checksum mismatch for {name} in model version {version}")
+        return manifest
+
+    def active_version(self):
+        """Name of the active version, or None"""
+        try:
+            with open(os.path.join(self.root, ACTIVE_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def activate(self, version):
+        """Point ACTIVE at a published version (atomic replace)"""
+        self.manifest(version)
+        tmp_path = os.path.join(self.root, f'{ACTIVE_FILE}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(self.root, ACTIVE_FILE))
+
+    def load(self, version=None, mmap=True, require_pipeline=True):
+        """
+        Verified, fully loaded HitPredictor for a version (default: active)
+        Args:
+            require_pipeline: reject models saved without a feature pipeline
+                (legacy pickles), which cannot score raw feature dicts
+        Returns:
+            (predictor, manifest)
+        """
+        version = version or self.active_version()
+        if version is None:
+            raise ValueError("No active model version")
+        manifest = self.verify(version)
+        predictor = HitPredictor(model_path=self.model_path(version), mmap=mmap)
+        predictor.load_model()
+        if require_pipeline and predictor.pipeline is None:
+            raise ValueError(f"Model version {version} has no feature pipeline; retrain it with train_model")
+        # One prediction here, so the first request does not pay first-use costs
+        predictor.predict_batch(np.zeros((1, predictor.artifact.n_features)))
+        return predictor, manifest
+
+
+class ModelWatcher:
+    def __init__(self, registry, interval=10.0):
+        """
+        Keeps the registry's active model loaded, reloading it in a background thread
+        Request handlers read `current` once and use that snapshot; a new
+        version is loaded and verified off the request path, then swapped in
+        with a single reference assignment, so requests never wait on a load
+        and never see a half-loaded model. A failed load keeps the old model.
+        Args:
+            registry: ModelRegistry
+            interval: seconds between checks of the active version
+        """
+        self.registry = registry
+        self.interval = interval
+        self.current = None
+        self.reloads = 0
+        self.failures = 0
+        self.last_error = None
+        self.last_check = None
+        self._failed_version = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """Load the active version if it differs from the current one"""
+        with self._lock:
+            self.last_check = time.time()
+            version = self.registry.active_version()
+            if version is None or (self.current is not None and self.current['version'] == version):
+                return False
+            # A version that failed to load is not retried until ACTIVE changes
+            if version == self._failed_version:
+                return False
+            start = time.perf_counter()
+            try:
+                predictor, manifest = self.registry.load(version)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = f"{version}: {e}"
+                self._failed_version = version
+                return False
+            self.current = {
+                'predictor': predictor,
+                'version': version,
+                'created_at': manifest['created_at'],
+                'loaded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'load_seconds': time.perf_counter() - start
+            }
+            self.reloads += 1
+            return True
+
+    def start(self):
+        """Load and keep checking in a daemon thread (until then, current is None)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='model-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        self.check()
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def info(self):
+        """Version and load details of the serving model (None if none is loaded)"""
+        current = self.current
+        if current is None:
+            return None
+        return {key: value for key, value in current.items() if key != 'predictor'}
+
+    def stats(self):
+        """Serving model info plus reload counters, for metrics endpoints"""
+        return {
+            'model': self.info(),
+            'active_version': self.registry.active_version(),
+            'reloads': self.reloads,
+            'failures': self.failures,
+            'last_error': self.last_error,
+            'last_check': self.last_check
+        }
+
+
+def main(argv=None):
+    """Command line: publish, list, activate and verify model versions"""
+    parser = argparse.ArgumentParser(description="Local HitPredictor model registry")
+    parser.add_argument('--root', default='data/models/registry')
+    commands = parser.add_subparsers(dest='command', required=True)
+    publish = commands.add_parser('publish', help="add a saved model as a new version")
+    publish.add_argument('model_path')
+    publish.add_argument('--no-activate', action='store_true')
+    commands.add_parser('list', help="list versions")
+    for name in ('activate', 'verify'):
+        commands.add_parser(name).add_argument('version')
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry(args.root)
+    try:
+        if args.command == 'publish':
+            version = registry.publish(args.model_path, activate=not args.no_activate)
+            print(f"Published {version}{'' if args.no_activate else ' (active)'}")
+        elif args.command == 'list':
+            active = registry.active_version()
+            for version in registry.versions():
+                manifest = registry.manifest(version)
+                print(f"{'*' if version == active else ' '} {version}  {manifest['created_at']}")
+        elif args.command == 'activate':
+            registry.activate(args.version)
+            print(f"Active version: {args.version}")
+        else:
+            registry.verify(args.version)
+            print(f"{args.version}: all checksums match")
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,12 @@
-import nltk
+"""
+Bundle the NLTK resources used by the backend into Backend/nltk_data
+Usage (from Backend/): python -m modules.nltk_dwnld
+Run once on a connected machine; the app never downloads at import time.
+"""
 import ssl
 
+from modules.nltk_resources import RESOURCES, LOCAL_NLTK_DATA, download
+
 try:
     _create_unverified_https_context = ssl._create_unverified_context
 except AttributeError:
@@ -8,5 +14,7 @@ except AttributeError:
 else:
     ssl._create_default_https_context = _create_unverified_https_context
 
-nltk.download('stopwords')
-nltk.download('vader_lexicon')
\ No newline at end of file
+if __name__ == "__main__":
+    for name in RESOURCES:
+        download(name)
+        print(f"Downloaded '{name}' to {LOCAL_NLTK_DATA}")
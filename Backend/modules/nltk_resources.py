@@ -0,0 +1,78 @@
+import os
+from functools import lru_cache
+
+# Bundled/cached NLTK data lives next to the Backend code unless overridden
+LOCAL_NLTK_DATA = os.environ.get(
+    'NLTK_LOCAL_DATA',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nltk_data')
+)
+
+# Resource name -> path looked up via nltk.data.find
+RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'vader_lexicon': 'sentiment/vader_lexicon.zip',
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+}
+
+
+@lru_cache(maxsize=None)
+def _nltk():
+    """Import nltk on first use and register the local data directory"""
+    import nltk
+    if LOCAL_NLTK_DATA not in nltk.data.path:
+        nltk.data.path.insert(0, LOCAL_NLTK_DATA)
+    return nltk
+
+
+def ensure_resource(name):
+    """
+    Make sure an NLTK resource is available locally
+    Only downloads when NLTK_ALLOW_DOWNLOAD=1; otherwise raises LookupError
+    pointing at modules/nltk_dwnld.py.
+    """
+    nltk = _nltk()
+    try:
+        nltk.data.find(RESOURCES[name])
+        return
+    except LookupError:
+        if os.environ.get('NLTK_ALLOW_DOWNLOAD') != '1':
+            raise LookupError(
+                f"NLTK resource '{name}' not found in {nltk.data.path}. "
+                f"Run 'python -m modules.nltk_dwnld' (from Backend/) to bundle it "
+                f"into {LOCAL_NLTK_DATA}, or set NLTK_ALLOW_DOWNLOAD=1."
+            ) from None
+    download(name)
+    nltk.data.find(RESOURCES[name])
+
+
+def download(name):
+    """Download a resource into the local data directory"""
+    os.makedirs(LOCAL_NLTK_DATA, exist_ok=True)
+    if not _nltk().download(name, download_dir=LOCAL_NLTK_DATA, quiet=True):
+        raise LookupError(f"Failed to download NLTK resource '{name}'")
+
+
+@lru_cache(maxsize=None)
+def get_stopwords(language='english'):
+    """English stopwords as a frozenset, loaded once per process"""
+    ensure_resource('stopwords')
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words(language))
+
+
+@lru_cache(maxsize=None)
+def get_vader():
+    """Shared VADER SentimentIntensityAnalyzer, built once per process"""
+    ensure_resource('vader_lexicon')
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+
+@lru_cache(maxsize=None)
+def get_word_tokenize():
+    """nltk.word_tokenize, after checking the punkt models are present"""
+    ensure_resource('punkt')
+    ensure_resource('punkt_tab')
+    from nltk.tokenize import word_tokenize
+    return word_tokenize
@@ -1,56 +1,142 @@
 import pickle
 import os
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report
+import itertools
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 import pandas as pd
 import numpy as np
+from modules.feature_pipeline import FEATURE_PIPELINE_FILE, FeaturePipeline
+from modules.model_artifact import ModelArtifact, artifact_path_for
+
+# RandomForestClassifier settings used unless overridden
+FOREST_PARAMS = {
+    'n_estimators': 100,
+    'max_depth': 10,
+    'class_weight': 'balanced'
+}
+
+# Default hyperparameter search space (values per parameter)
+PARAM_GRID = {
+    'n_estimators': [100, 200, 400],
+    'max_depth': [8, 10, 16, None],
+    'min_samples_leaf': [1, 2, 5],
+    'max_features': ['sqrt', 0.5]
+}
+
+# Training data shared by the hyperparameter search workers
+_search_data = None
+
+
+def _init_search_worker(X, y, cv, scoring, random_state):
+    """Receive the training data once per worker process"""
+    global _search_data
+    _search_data = (X, y, cv, scoring, random_state)
+
+
+def _evaluate_params(params):
+    """Cross-validate one parameter set inside a worker process"""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import StratifiedKFold, cross_val_score
+    
+    X, y, cv, scoring, random_state = _search_data
+    model = RandomForestClassifier(**{**FOREST_PARAMS, **params, 'random_state': random_state, 'n_jobs': 1})
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+    start = time.perf_counter()
+    scores = cross_val_score(model, X, y, cv=folds, scoring=scoring)
+    return {
+        'params': params,
+        'mean_score': float(scores.mean()),
+        'std_score': float(scores.std()),
+        'seconds': time.perf_counter() - start
+    }
+
+
+def fit_time_report(X, y, row_counts=(10_000, 50_000, 100_000), tree_counts=(50, 100, 200),
+                    n_jobs=-1, params=None, random_state=42):
+    """
+    Forest fit time for every (rows, trees) combination, for planning retraining
+    Args:
+        X, y: processed feature rows and labels; subsets are taken from the top
+        row_counts, tree_counts: grid to time (row counts above len(X) are skipped)
+        n_jobs: cores used per fit (-1 = all)
+        params: RandomForestClassifier parameters overriding FOREST_PARAMS
+    Returns:
+        DataFrame with rows, trees, fit_seconds and us_per_row_tree (the
+        quantity to extrapolate, roughly constant up to a log factor in rows)
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    
+    report = []
+    for n_rows in row_counts:
+        if n_rows > len(X):
+            continue
+        for n_trees in tree_counts:
+            model = RandomForestClassifier(**{
+                **FOREST_PARAMS, **(params or {}),
+                'n_estimators': n_trees, 'n_jobs': n_jobs, 'random_state': random_state
+            })
+            start = time.perf_counter()
+            model.fit(X[:n_rows], y[:n_rows])
+            seconds = time.perf_counter() - start
+            report.append({
+                'rows': n_rows,
+                'trees': n_trees,
+                'fit_seconds': seconds,
+                'us_per_row_tree': seconds * 1e6 / (n_rows * n_trees)
+            })
+    return pd.DataFrame(report)
+
 
 class HitPredictor:
-    def __init__(self, model_path='data/models/hit_predictor.pkl'):
+    def __init__(self, model_path='data/models/hit_predictor.pkl', mmap=True):
+        """
+        Args:
+            model_path: pickled model; its memory-mappable artifact lives in
+                the directory of the same name without '.pkl'
+            mmap: memory-map the artifact arrays so worker processes share
+                one read-only copy of the forest
+        The model is loaded on the first prediction, not here.
+        """
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = None
         self.model_path = model_path
+        self.artifact_path = artifact_path_for(model_path)
+        self.mmap = mmap
+        self.artifact = None
+        self.pipeline = None
         self.feature_importance = None
-        
-        # Try to load pre-trained model
-        if os.path.exists(model_path):
-            self.load_model()
+        self._load_attempted = False
     
-    def train_model(self, X, y, test_size=0.2, random_state=42):
-        """Train and evaluate the prediction model"""
-         # Convert categorical columns to numerical if needed
-        categorical_cols = X.select_dtypes(include=['object']).columns
-        numerical_cols = X.select_dtypes(exclude=['object']).columns
-        
-        # Option 1: One-hot encode categorical columns
-        from sklearn.preprocessing import OneHotEncoder
-        encoder = OneHotEncoder(handle_unknown='ignore', sparse_output=False)
-        X_categorical = encoder.fit_transform(X[categorical_cols])
+    def train_model(self, X, y, test_size=0.2, random_state=42, n_jobs=-1, params=None):
+        """
+        Train and evaluate the prediction model
+        Args:
+            n_jobs: cores used to fit trees (-1 = all)
+            params: RandomForestClassifier parameters overriding FOREST_PARAMS,
+                e.g. the best parameters from search_hyperparameters
+        """
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import classification_report
         
-        # Scale numerical columns
-        X_numerical = self.scaler.fit_transform(X[numerical_cols])
-        
-        # Combine features
-        X_processed = np.concatenate([X_numerical, X_categorical], axis=1)
-        
-        # Train-test split
+        # Train-test split on the raw rows, so the feature pipeline
+        # (category vocabularies, scaling) is fitted once, on training data
         X_train, X_test, y_train, y_test = train_test_split(
-            X_processed, y, test_size=test_size, random_state=random_state
+            X, y, test_size=test_size, random_state=random_state
         )
         
-        # Feature scaling
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        # One-hot encode object columns, standardize the rest; the same saved
+        # pipeline transforms features at prediction time
+        self.pipeline = FeaturePipeline.fit(X_train)
+        self.scaler = None
+        X_train_scaled = self.pipeline.transform(X_train)
+        X_test_scaled = self.pipeline.transform(X_test)
         
         # Initialize and train model
-        self.model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
-            random_state=random_state,
-            class_weight='balanced'
-        )
+        self.model = RandomForestClassifier(**{
+            **FOREST_PARAMS, **(params or {}),
+            'random_state': random_state, 'n_jobs': n_jobs
+        })
         self.model.fit(X_train_scaled, y_train)
         
         # Evaluate
@@ -58,75 +144,251 @@ class HitPredictor:
         print("\nModel Evaluation:")
         print(classification_report(y_test, y_pred))
         
-        # Store feature importance
+        self._store_model()
+    
+    def grow_model(self, X, y, n_new_trees=50, n_jobs=-1):
+        """
+        Add trees fitted on new data to the trained forest (warm start)
+        Existing trees are kept unchanged and the saved feature pipeline is
+        reused, so this costs a fit of n_new_trees on the new rows only.
+        With class_weight='balanced' the new trees are weighted by the class
+        balance of the new rows; refit with train_model now and then.
+        Args:
+            X, y: new raw feature rows (same columns as training) and labels
+            n_new_trees: trees to add
+            n_jobs: cores used to fit trees (-1 = all)
+        """
+        self._ensure_loaded()
+        if self.model is None:
+            if not os.path.exists(self.model_path):
+                raise ValueError("Model not trained or loaded")
+            # Warm start needs the sklearn forest, which only the pickle holds
+            with open(self.model_path, 'rb') as f:
+                data = pickle.load(f)
+                self.model = data['model']
+                self.scaler = data['scaler']
+        
+        features = self.artifact.transform(self.transform(X))
+        self.model.set_params(
+            warm_start=True,
+            n_estimators=len(self.model.estimators_) + n_new_trees,
+            n_jobs=n_jobs
+        )
+        self.model.fit(features, y)
+        self.model.set_params(warm_start=False)
+        self._store_model()
+    
+    def search_hyperparameters(self, X, y, param_grid=None, time_budget=300, cv=3,
+                               scoring='balanced_accuracy', n_jobs=-1, random_state=42):
+        """
+        Time-budgeted random search over param_grid, cross-validated in a process pool
+        Candidates are drawn in random order from the grid; no new evaluation
+        starts once time_budget seconds have passed (running ones finish).
+        Args:
+            X, y: raw feature rows and labels
+            param_grid: dict parameter -> values (default PARAM_GRID)
+            time_budget: seconds
+            cv: stratified folds per candidate
+            scoring: sklearn scoring name
+            n_jobs: worker processes (-1 = all cores); each fits single-threaded
+        Returns:
+            (best_params, results): results is a DataFrame of evaluated
+            candidates sorted by mean_score, best first
+        """
+        if n_jobs is None or n_jobs < 1:
+            n_jobs = os.cpu_count() or 1
+        param_grid = param_grid or PARAM_GRID
+        names = list(param_grid)
+        candidates = [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+        np.random.RandomState(random_state).shuffle(candidates)
+        candidates = iter(candidates)
+        
+        # Vocabularies and scaling carry no label information, so one
+        # pipeline fitted on all rows serves every fold
+        features = FeaturePipeline.fit(X).transform(X) if isinstance(X, pd.DataFrame) else np.asarray(X)
+        deadline = time.monotonic() + time_budget
+        results = []
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_search_worker,
+            initargs=(features, np.asarray(y), cv, scoring, random_state)
+        ) as pool:
+            pending = set()
+            while True:
+                while len(pending) < n_jobs and time.monotonic() < deadline:
+                    params = next(candidates, None)
+                    if params is None:
+                        break
+                    pending.add(pool.submit(_evaluate_params, params))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                results.extend(future.result() for future in done)
+        
+        results = pd.DataFrame(results, columns=['params', 'mean_score', 'std_score', 'seconds'])
+        results = results.sort_values('mean_score', ascending=False, kind='stable').reset_index(drop=True)
+        best_params = results['params'].iloc[0] if len(results) else None
+        return best_params, results
+    
+    def _store_model(self):
+        """Refresh importances and the artifact from self.model, then save"""
+        # Store feature importance (indices into the model's input columns)
         self.feature_importance = dict(zip(
-            range(X.shape[1]), 
+            range(self.model.n_features_in_), 
             self.model.feature_importances_
         ))
+        self.artifact = ModelArtifact.from_sklearn(self.model, self.scaler, self.feature_importance)
         
         # Save model
         self.save_model()
     
-    def predict(self, features):
-        """Make prediction for new song features"""
-        if not self.model:
+    def predict_batch(self, features, explain=False, top_n=3):
+        """
+        Predict many songs with a single forest pass
+        Args:
+            features: raw features (see transform), or processed feature
+                rows as a 2-D array; a 1-D list/array/Series is a single song
+            explain: also return per-song tree-path contributions to
+                probability_top_chart, computed in the same pass
+            top_n: number of per-song top features when explaining
+        Returns:
+            dict of arrays aligned with the input rows: 'prediction',
+            'probability_top_chart' and 'confidence'; with explain=True also
+            'contributions' (n_songs, n_features), 'top_features' (indices by
+            descending |contribution|, n_songs x top_n) and the scalar 'bias',
+            so bias + contributions.sum(axis=1) == probability_top_chart
+        """
+        self._ensure_loaded()
+        if self.artifact is None:
             raise ValueError("Model not trained or loaded")
         
-        # Ensure features are in correct format
-        if isinstance(features, (list, pd.Series)):
-            features = np.array(features).reshape(1, -1)
-        elif isinstance(features, pd.DataFrame):
-            features = features.values
+        features = self.transform(features)
+        scaled_features = self.artifact.transform(features)
         
-        # Scale features
-        scaled_features = self.scaler.transform(features)
+        # Same probabilities as the sklearn forest, computed on the flat
+        # (possibly memory-mapped) arrays; the predicted class is their argmax,
+        # exactly what RandomForestClassifier.predict returns
+        if explain:
+            proba, contributions = self.artifact.explain(scaled_features)
+        else:
+            proba = self.artifact.predict_proba(scaled_features)
+        predictions = self.artifact.classes.take(np.argmax(proba, axis=1))
         
-        # Make prediction
-        proba = self.model.predict_proba(scaled_features)[0]
-        prediction = self.model.predict(scaled_features)[0]
+        result = {
+            'prediction': predictions,
+            'probability_top_chart': proba[:, 1],
+            'confidence': proba.max(axis=1)
+        }
+        if explain:
+            contributions = contributions[:, :, 1]
+            result['contributions'] = contributions
+            result['top_features'] = np.argsort(-np.abs(contributions), axis=1, kind='stable')[:, :top_n]
+            result['bias'] = float(self.artifact.bias[1])
+        return result
+    
+    def predict(self, features):
+        """Make prediction for new song features, with its own top features"""
+        features = self.transform(features)
+        result = self.predict_batch(features[:1], explain=True)
         
         return {
-            'prediction': prediction,
-            'probability_top_chart': proba[1],
-            'confidence': max(proba),
-            'feature_importance': self._get_important_features(features)
+            'prediction': result['prediction'][0],
+            'probability_top_chart': result['probability_top_chart'][0],
+            'confidence': result['confidence'][0],
+            'feature_importance': self._get_important_features(features[0], result, 0)
         }
     
+    def transform(self, features):
+        """
+        Model input rows for raw song features
+        DataFrames, a dict (one song) or a list of dicts go through the saved
+        feature pipeline; arrays are taken as already-processed rows. Models
+        saved without a pipeline take DataFrames as processed rows too, and
+        raise ValueError for dicts, which have no column order to follow.
+        """
+        self._ensure_loaded()
+        is_records = isinstance(features, dict) or (
+            isinstance(features, list) and features and isinstance(features[0], dict)
+        )
+        if self.pipeline is not None and (is_records or isinstance(features, pd.DataFrame)):
+            return self.pipeline.transform(features)
+        if is_records:
+            raise ValueError("Model has no feature pipeline; pass processed feature rows as an array")
+        return self._as_2d(features)
+    
+    @staticmethod
+    def _as_2d(features):
+        """Feature rows as a 2-D NumPy array"""
+        if isinstance(features, pd.DataFrame):
+            return features.values
+        features = np.asarray(features)
+        return features.reshape(1, -1) if features.ndim == 1 else features
+    
     def save_model(self):
-        """Save model and scaler to disk"""
+        """Save model and scaler to disk, plus the memory-mappable artifact"""
         try:
             os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
             with open(self.model_path, 'wb') as f:
                 pickle.dump({
                     'model': self.model,
                     'scaler': self.scaler,
+                    'pipeline': self.pipeline,
                     'feature_importance': self.feature_importance
                 }, f)
+            self.artifact.save(self.artifact_path)
+            if self.pipeline is not None:
+                self.pipeline.save(self.artifact_path)
         except Exception as e:
             print(f"Failed to save model: {str(e)}")
             raise
     
     def load_model(self):
-        """Load model and scaler from disk"""
+        """
+        Load the model from disk
+        Prefers the artifact directory (memory-mapped when mmap=True); a
+        pickle-only model is exported to arrays in memory instead (run
+        'python -m modules.model_artifact' once to convert it).
+        """
+        self._load_attempted = True
+        if os.path.exists(os.path.join(self.artifact_path, 'meta.json')):
+            self.artifact = ModelArtifact.load(self.artifact_path, mmap=self.mmap)
+            self.feature_importance = self.artifact.feature_importance
+            if os.path.exists(os.path.join(self.artifact_path, FEATURE_PIPELINE_FILE)):
+                self.pipeline = FeaturePipeline.load(self.artifact_path)
+            return
+        
         with open(self.model_path, 'rb') as f:
             data = pickle.load(f)
             self.model = data['model']
             self.scaler = data['scaler']
+            self.pipeline = data.get('pipeline')
             self.feature_importance = data.get('feature_importance')
+        self.artifact = ModelArtifact.from_sklearn(self.model, self.scaler, self.feature_importance)
     
-    def _get_important_features(self, features):
-        """Get most influential features for a prediction"""
-        if not self.feature_importance:
-            return None
-        
-        # Get indices of top 3 most important features
-        top_indices = sorted(
-            self.feature_importance.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:3]
-        
+    def _ensure_loaded(self):
+        """Load a saved model on first use, if there is one"""
+        if self.artifact is not None or self._load_attempted:
+            return
+        self._load_attempted = True
+        if os.path.exists(self.artifact_path) or os.path.exists(self.model_path):
+            self.load_model()
+    
+    def _get_important_features(self, features, result, row):
+        """
+        Features that moved one song's prediction most
+        Returns:
+            list of (feature index, contribution to probability_top_chart,
+            feature value) from an explained predict_batch result
+        """
+        contributions = result['contributions'][row]
         return [
-            (idx, self.feature_importance[idx], features[0][idx])
-            for idx, _ in top_indices
-        ]
\ No newline at end of file
+            (int(idx), float(contributions[idx]), features[idx])
+            for idx in result['top_features'][row]
+        ]
+    
+    def get_global_importance(self, n=3):
+        """Top n (feature index, importance) pairs, ordered once at load time"""
+        self._ensure_loaded()
+        if self.artifact is None or not self.feature_importance:
+            return None
+        return [(int(idx), float(self.artifact.importance[idx])) for idx in self.artifact.importance_order[:n]]
\ No newline at end of file
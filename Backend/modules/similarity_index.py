@@ -0,0 +1,252 @@
+import json
+import os
+import zlib
+
+import numpy as np
+
+# Universal hashing (a * x + b) mod p over 32-bit token hashes; a < 2**31 keeps
+# a * x + b inside uint64
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+# Odd multiplier for folding a band id and its rows into a single uint64 bucket key
+_BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+_FILES = ('signatures.npy', 'sizes.npy', 'keys.npy', 'bucket_keys.npy', 'bucket_docs.npy')
+
+
+class MinHashLSHIndex:
+    def __init__(self, num_perm=128, bands=32, seed=1):
+        """
+        Approximate nearest-neighbour index over token sets (MinHash + LSH banding)
+        Songs sharing any band of their MinHash signature become candidates,
+        which are ranked by cosine estimated from the signatures and stored set
+        sizes. Indexed songs live in sorted NumPy arrays that can be saved and
+        loaded memory-mapped; new songs go to an in-memory tier until save().
+        Args:
+            num_perm: MinHash permutations (signature length)
+            bands: LSH bands; num_perm / bands rows per band. Songs become
+                likely candidates above a Jaccard similarity of about
+                (1 / bands) ** (1 / rows): 0.42 for the default 32 x 4. More
+                bands find less similar songs at the cost of more candidates
+                (64 x 2, threshold 0.13, matches most songs that share
+                common words)
+            seed: permutation seed, persisted with the index
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.seed = seed
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+
+        # Persisted tier (possibly memory-mapped)
+        self.signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self.sizes = np.zeros(0, dtype=np.uint32)
+        self.keys = np.zeros(0, dtype=np.int64)
+        # Every (song, band) bucket key in one sorted array, so a query looks
+        # up all of its bands with a single vectorized searchsorted
+        self.bucket_keys = np.zeros(0, dtype=np.uint64)
+        self.bucket_docs = np.zeros(0, dtype=np.int64)
+        # In-memory tier of songs added since the last save/load
+        self._pending_signatures = []
+        self._pending_sizes = []
+        self._pending_keys = []
+        self._pending_buckets = {}
+
+    def __len__(self):
+        return len(self.keys) + len(self._pending_keys)
+
+    def signature(self, tokens):
+        """MinHash signature (uint32 array of length num_perm) of a token collection"""
+        tokens = set(tokens)
+        if not tokens:
+            return np.full(self.num_perm, 0xFFFFFFFF, dtype=np.uint32)
+        hashes = np.fromiter(
+            (zlib.crc32(token.encode('utf-8')) for token in tokens),
+            dtype=np.uint64, count=len(tokens)
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _bucket_keys(self, signatures):
+        """(n, num_perm) signatures -> (n, bands) uint64 bucket keys, distinct per band"""
+        bands = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        keys = np.broadcast_to(np.arange(1, self.bands + 1, dtype=np.uint64), bands.shape[:2])
+        for row in range(self.rows):
+            keys = keys * _BAND_MULTIPLIER + bands[:, :, row]
+        return keys
+
+    def add(self, key, tokens):
+        """Insert one song (integer key) without touching the persisted tier"""
+        signature = self.signature(tokens)
+        doc = len(self)
+        self._pending_signatures.append(signature)
+        self._pending_sizes.append(len(set(tokens)))
+        self._pending_keys.append(int(key))
+        for bucket_key in self._bucket_keys(signature[None])[0].tolist():
+            self._pending_buckets.setdefault(bucket_key, []).append(doc)
+        return doc
+
+    def query(self, tokens, k=10):
+        """
+        Approximate top-k most similar indexed songs
+        Returns:
+            list of (key, estimated cosine) pairs, best first
+        """
+        signature = self.signature(tokens)
+        size = len(set(tokens))
+        if size == 0 or len(self) == 0:
+            return []
+
+        candidates = self._candidates(signature)
+        if len(candidates) == 0:
+            return []
+
+        signatures, sizes, keys = self._rows(candidates)
+        # Jaccard estimate -> intersection -> binary cosine
+        jaccard = (signatures == signature).mean(axis=1)
+        intersection = jaccard * (sizes + size) / (1 + jaccard)
+        scores = intersection / np.sqrt(sizes * float(size))
+        top = np.argsort(-scores, kind='stable')[:k]
+        return [(int(keys[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+    def _candidates(self, signature):
+        """Sorted doc positions sharing at least one band bucket with a signature"""
+        bucket_keys = self._bucket_keys(signature[None])[0]
+        starts = np.searchsorted(self.bucket_keys, bucket_keys, side='left')
+        lengths = np.searchsorted(self.bucket_keys, bucket_keys, side='right') - starts
+        # Positions of every matching run, concatenated without a Python loop
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        candidates = [np.asarray(self.bucket_docs[offsets + np.arange(lengths.sum())])]
+        if self._pending_buckets:
+            for bucket_key in bucket_keys.tolist():
+                candidates.append(self._pending_buckets.get(bucket_key, []))
+        return np.unique(np.concatenate(candidates).astype(np.int64))
+
+    def _rows(self, docs):
+        """Signatures, set sizes and keys of doc positions across both tiers"""
+        n_saved = len(self.keys)
+        saved = docs[docs < n_saved]
+        pending = docs[docs >= n_saved] - n_saved
+        signatures = np.asarray(self.signatures[saved])
+        sizes = np.asarray(self.sizes[saved], dtype=np.float64)
+        keys = np.asarray(self.keys[saved])
+        if len(pending):
+            pending = pending.tolist()
+            signatures = np.vstack([signatures] + [self._pending_signatures[i] for i in pending])
+            sizes = np.concatenate([sizes, [self._pending_sizes[i] for i in pending]])
+            keys = np.concatenate([keys, [self._pending_keys[i] for i in pending]])
+        return signatures, sizes, keys
+
+    def save(self, path):
+        """
+        Merge pending songs into the sorted arrays and write them under path
+        Files are written to temporary names and swapped in with os.replace.
+        """
+        os.makedirs(path, exist_ok=True)
+        signatures = np.asarray(self.signatures)
+        sizes = np.asarray(self.sizes)
+        keys = np.asarray(self.keys)
+        if self._pending_keys:
+            signatures = np.vstack([signatures, np.array(self._pending_signatures, dtype=np.uint32)])
+            sizes = np.concatenate([sizes, np.array(self._pending_sizes, dtype=np.uint32)])
+            keys = np.concatenate([keys, np.array(self._pending_keys, dtype=np.int64)])
+        bucket_keys = self._bucket_keys(signatures).ravel()
+        order = np.argsort(bucket_keys, kind='stable')
+        bucket_keys = bucket_keys[order]
+        bucket_docs = order // self.bands
+
+        arrays = dict(zip(_FILES, (signatures, sizes, keys, bucket_keys, bucket_docs)))
+        for name, array in arrays.items():
+            with open(os.path.join(path, name + '.tmp'), 'wb') as f:
+                np.save(f, array)
+        meta = {'num_perm': self.num_perm, 'bands': self.bands, 'seed': self.seed, 'count': len(keys)}
+        with open(os.path.join(path, 'meta.json.tmp'), 'w') as f:
+            json.dump(meta, f)
+        for name in list(_FILES) + ['meta.json']:
+            os.replace(os.path.join(path, name + '.tmp'), os.path.join(path, name))
+
+        self.signatures, self.sizes, self.keys = signatures, sizes, keys
+        self.bucket_keys, self.bucket_docs = bucket_keys, bucket_docs
+        self._pending_signatures, self._pending_sizes, self._pending_keys = [], [], []
+        self._pending_buckets = {}
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Open a saved index; arrays are memory-mapped unless mmap=False"""
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        index = cls(num_perm=meta['num_perm'], bands=meta['bands'], seed=meta['seed'])
+        mode = 'r' if mmap else None
+        (index.signatures, index.sizes, index.keys,
+         index.bucket_keys, index.bucket_docs) = (
+            np.load(os.path.join(path, name), mmap_mode=mode) for name in _FILES
+        )
+        return index
+
+
+def binary_term_matrix(token_sets):
+    """
+    Binary term matrix used for exact cosine in recall_report
+    Returns:
+        L2-normalized sparse (n x vocabulary) matrix; row dot products are
+        the same cosines Cosine_Similarity computes in binary mode
+    """
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.preprocessing import normalize
+
+    vectorizer = CountVectorizer(analyzer=lambda tokens: list(tokens), binary=True, dtype=np.float64)
+    return normalize(vectorizer.fit_transform(token_sets).tocsr(), norm='l2', copy=False)
+
+
+def recall_report(index, token_sets, keys=None, k=10, n_queries=200, seed=0):
+    """
+    Recall of index.query against exact binary cosine top-k
+    Args:
+        index: MinHashLSHIndex holding token_sets under keys
+        token_sets: list of token collections, as indexed
+        keys: index keys of token_sets (default: positions)
+        k: neighbours per query (the query song itself is excluded)
+        n_queries: sampled query songs
+    Returns:
+        dict with recall@k, mean/p99 query latency in ms, mean LSH
+        candidates per query and the mean absolute error of the estimated
+        cosines
+    """
+    import time
+
+    keys = np.arange(len(token_sets)) if keys is None else np.asarray(keys)
+    matrix = binary_term_matrix(token_sets)
+    position = {key: i for i, key in enumerate(keys)}
+    rng = np.random.RandomState(seed)
+    queries = rng.choice(len(token_sets), size=min(n_queries, len(token_sets)), replace=False)
+
+    hits, total, errors, latencies, candidates = 0, 0, [], [], []
+    for query in queries:
+        exact = (matrix @ matrix[query].T).toarray().ravel()
+        exact[query] = -1
+        expected = [i for i in np.argsort(-exact, kind='stable')[:k] if exact[i] > 0]
+
+        start = time.perf_counter()
+        found = index.query(token_sets[query], k=k + 1)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found = [(key, score) for key, score in found if key != keys[query]][:k]
+        candidates.append(len(index._candidates(index.signature(token_sets[query]))))
+
+        found_keys = {key for key, _ in found}
+        hits += sum(1 for i in expected if keys[i] in found_keys)
+        total += len(expected)
+        errors += [abs(score - exact[position[key]]) for key, score in found]
+
+    return {
+        'queries': len(queries),
+        'k': k,
+        'recall': hits / total if total else 1.0,
+        'mean_query_ms': float(np.mean(latencies)),
+        'p99_query_ms': float(np.percentile(latencies, 99)),
+        'mean_candidates': float(np.mean(candidates)),
+        'mean_abs_cosine_error': float(np.mean(errors)) if errors else 0.0
+    }
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+from modules.corpus_aggregation import extract_terms
+
+WEIGHTINGS = ('binary', 'tf', 'tfidf')
+
+# Dense scratch per score cell: float32 scores, their negation and int64 argpartition indices
+_BYTES_PER_CELL = 16
+
+
+def build_song_matrix(lyrics, stop_words, weighting='tfidf', corpus_stats=None):
+    """
+    L2-normalized sparse (n_songs x vocabulary) term matrix
+    Args:
+        lyrics: list of lyrics strings (non-strings become empty rows)
+        stop_words: set of words to ignore
+        weighting: 'binary', 'tf' or 'tfidf'
+        corpus_stats: optional CorpusStats supplying idf for 'tfidf'; without
+            it idf comes from the lyrics themselves (same smoothed formula)
+    Returns:
+        float32 CSR matrix whose row dot products are cosine similarities
+    """
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.preprocessing import normalize
+
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"weighting must be one of {WEIGHTINGS}")
+
+    # Same terms as LyricAnalyzer/CorpusStats: lowercased alphabetic non-stopwords
+    vectorizer = CountVectorizer(
+        analyzer=lambda text: extract_terms(text, stop_words, ngram_range=(1, 1)),
+        binary=weighting == 'binary', dtype=np.float32
+    )
+    matrix = vectorizer.fit_transform(lyrics).tocsr()
+
+    if weighting == 'tfidf':
+        if corpus_stats is not None:
+            idf = corpus_stats.idf_array(vectorizer.get_feature_names_out())
+        else:
+            doc_freq = np.bincount(matrix.indices, minlength=matrix.shape[1])
+            idf = np.log((1 + matrix.shape[0]) / (1 + doc_freq)) + 1
+        matrix.data *= idf.astype(np.float32)[matrix.indices]
+    return normalize(matrix, norm='l2', copy=False)
+
+
+def _top_k_block(scores, k, row_offset):
+    """Top-k (row, col, score) triples of a dense score block, best first per row"""
+    k = min(k, scores.shape[1])
+    cols = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top = np.take_along_axis(scores, cols, axis=1)
+    order = np.argsort(-top, axis=1, kind='stable')
+    cols = np.take_along_axis(cols, order, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    rows = np.repeat(np.arange(row_offset, row_offset + scores.shape[0], dtype=np.int32), k)
+    keep = top.ravel() > 0
+    return rows[keep], cols.ravel()[keep].astype(np.int32), top.ravel()[keep]
+
+
+def top_k_similar(matrix, other=None, k=10, max_block_mb=256):
+    """
+    Top-k most similar songs per row, computed in row blocks
+    Args:
+        matrix: L2-normalized (N x V) sparse matrix from build_song_matrix
+        other: optional (M x V) matrix to compare against; defaults to
+            matrix itself, in which case a song is never its own neighbour
+        k: neighbours to keep per row
+        max_block_mb: memory cap for the dense scratch of one row block
+    Returns:
+        DataFrame with columns row (int32), col (int32), score (float32),
+        sorted by row then descending score; zero-similarity pairs are dropped
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    self_join = other is None
+    other = (matrix if self_join else other).tocsr()
+    n_cols = other.shape[0]
+    # Each block row costs a dense vocabulary row plus its scratch score row
+    bytes_per_row = _BYTES_PER_CELL * max(n_cols, 1) + 4 * matrix.shape[1]
+    block_rows = max(1, int(max_block_mb * 2 ** 20) // bytes_per_row)
+
+    rows, cols, scores = [], [], []
+    for start in range(0, matrix.shape[0], block_rows):
+        # sparse @ dense runs in one C loop, far faster than a sparse x sparse
+        # product whose output is mostly non-zero
+        dense_rows = matrix[start:start + block_rows].toarray()
+        block = np.ascontiguousarray((other @ dense_rows.T).T)
+        if self_join:
+            diagonal = np.arange(block.shape[0])
+            block[diagonal, start + diagonal] = -np.inf
+        if n_cols:
+            block_result = _top_k_block(block, k, start)
+            rows.append(block_result[0])
+            cols.append(block_result[1])
+            scores.append(block_result[2])
+
+    if not rows:
+        return pd.DataFrame({
+            'row': np.array([], dtype=np.int32),
+            'col': np.array([], dtype=np.int32),
+            'score': np.array([], dtype=np.float32)
+        })
+    return pd.DataFrame({
+        'row': np.concatenate(rows),
+        'col': np.concatenate(cols),
+        'score': np.concatenate(scores).astype(np.float32)
+    })
+
+
+def similar_songs(lyrics, stop_words, other_lyrics=None, k=10, weighting='tfidf',
+                  corpus_stats=None, max_block_mb=256):
+    """
+    All-pairs "songs like this one" over a lyrics corpus
+    Args:
+        lyrics: list of N lyrics strings (rows of the result)
+        stop_words: set of words to ignore
+        other_lyrics: optional list of M lyrics to match against (cols);
+            defaults to lyrics itself, excluding self-matches
+        k, max_block_mb: see top_k_similar
+        weighting, corpus_stats: see build_song_matrix
+    Returns:
+        (row, col, score) DataFrame of positional indices into the inputs
+    """
+    if other_lyrics is None:
+        matrix = build_song_matrix(lyrics, stop_words, weighting, corpus_stats)
+        return top_k_similar(matrix, k=k, max_block_mb=max_block_mb)
+    # One vocabulary (and idf) for both sides
+    combined = build_song_matrix(list(lyrics) + list(other_lyrics), stop_words, weighting, corpus_stats)
+    return top_k_similar(combined[:len(lyrics)], combined[len(lyrics):], k=k, max_block_mb=max_block_mb)
@@ -0,0 +1,64 @@
+import hashlib
+import os
+
+import numpy as np
+
+# Bump when tokenization or stopword filtering changes so cached files are rebuilt
+TERM_CACHE_VERSION = '2'
+
+
+class TermCountCache:
+    def __init__(self, cache_dir):
+        """
+        On-disk cache of per-file (terms, counts) arrays
+        Entries are keyed by absolute path, mtime and size (plus the text
+        column and tokenizer name), so a changed file simply misses and is
+        re-tokenized.
+        Args:
+            cache_dir: directory holding one .npz file per entry
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(file_path, text_column, tokenizer='fast'):
+        """Hash of path, modification time, size, column, tokenizer and cache version"""
+        stat = os.stat(file_path)
+        payload = '\0'.join([
+            TERM_CACHE_VERSION, os.path.abspath(file_path),
+            str(stat.st_mtime_ns), str(stat.st_size), text_column, tokenizer
+        ])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.npz')
+
+    def get(self, file_path, text_column, tokenizer='fast'):
+        """Return cached (terms, counts) or None"""
+        entry = self._entry_path(self.make_key(file_path, text_column, tokenizer))
+        if not os.path.exists(entry):
+            self.misses += 1
+            return None
+        with np.load(entry) as data:
+            self.hits += 1
+            text = data['terms'].tobytes().decode('utf-8')
+            terms = np.array(text.split('\0') if text else [], dtype=object)
+            return terms, data['counts']
+
+    def put(self, file_path, text_column, term_counts, tokenizer='fast'):
+        """Store (terms, counts); written to a temporary file and renamed into place"""
+        entry = self._entry_path(self.make_key(file_path, text_column, tokenizer))
+        tmp_path = f'{entry}.{os.getpid()}.tmp'
+        terms, counts = term_counts
+        # Terms as one NUL-separated UTF-8 buffer: no per-term padding, and
+        # no pickled object array to load
+        text = '\0'.join(terms).encode('utf-8')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, terms=np.frombuffer(text, dtype=np.uint8), counts=counts)
+        os.replace(tmp_path, entry)
+
+    def stats(self):
+        """Hit/miss counters for this process"""
+        return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,221 @@
+import json
+
+from modules.tokenizer import word_tokens
+
+
+def normalize_keyword(keyword):
+    """Lowercased keyword with its \\w+ tokens joined by single spaces"""
+    return ' '.join(word_tokens(keyword))
+
+
+def load_theme_lexicon(path):
+    """
+    Load theme keywords from a JSON lexicon file
+    The file maps theme name -> list of words or multi-word phrases, e.g.
+    {"breakup": ["goodbye", "break my heart"], "money": ["money on my mind"]},
+    or theme name -> {keyword: weight} for weighted theme scores, e.g.
+    {"breakup": {"goodbye": 1.0, "break my heart": 3.0}}
+    Returns:
+        dict mapping theme name -> list of keywords or dict keyword -> weight
+    """
+    with open(path, encoding='utf-8') as f:
+        lexicon = json.load(f)
+    if not isinstance(lexicon, dict):
+        raise ValueError(f"Theme lexicon {path} must map theme names to keyword lists")
+    for theme, keywords in lexicon.items():
+        if isinstance(keywords, dict):
+            if not all(isinstance(weight, (int, float)) and not isinstance(weight, bool)
+                       for weight in keywords.values()):
+                raise ValueError(f"Theme '{theme}' in {path} must map keywords to numeric weights")
+        elif not isinstance(keywords, list) or not all(isinstance(kw, str) for kw in keywords):
+            raise ValueError(f"Theme '{theme}' in {path} must be a list of strings")
+    return lexicon
+
+
+def has_phrases(theme_keywords):
+    """True if any keyword spans more than one token"""
+    return any(' ' in normalize_keyword(kw) for kws in theme_keywords.values() for kw in kws)
+
+
+def has_weights(theme_keywords):
+    """True if any theme maps its keywords to weights rather than listing them"""
+    return any(isinstance(kws, dict) for kws in theme_keywords.values())
+
+
+class ThemeMatcher:
+    def __init__(self, theme_keywords):
+        """
+        Compile theme keyword lists into an inverted index
+        Args:
+            theme_keywords: dict mapping theme name -> list of keywords
+        """
+        if has_phrases(theme_keywords):
+            raise ValueError("ThemeMatcher only matches single words; use PhraseThemeMatcher for phrases")
+        self.themes = list(theme_keywords)
+        self.index = {}
+        for theme_id, theme in enumerate(self.themes):
+            for keyword in theme_keywords[theme]:
+                theme_ids = self.index.setdefault(normalize_keyword(keyword), [])
+                if theme_id not in theme_ids:
+                    theme_ids.append(theme_id)
+        # Tuples are cheaper to iterate in the hot loop
+        self.index = {keyword: tuple(ids) for keyword, ids in self.index.items()}
+
+    def count(self, text):
+        """Return per-theme keyword hit counts (in theme order) from one tokenization pass"""
+        counts = [0] * len(self.themes)
+        if not isinstance(text, str):
+            return counts
+        index = self.index
+        for token in word_tokens(text):
+            theme_ids = index.get(token)
+            if theme_ids:
+                for theme_id in theme_ids:
+                    counts[theme_id] += 1
+        return counts
+
+    def match(self, text):
+        """Return {'theme_<name>': 0/1} flags for every theme"""
+        return {
+            f'theme_{theme}': int(hits > 0)
+            for theme, hits in zip(self.themes, self.count(text))
+        }
+
+    def match_with_counts(self, text):
+        """Return theme flags plus 'theme_<name>_hits' counts for every theme"""
+        counts = self.count(text)
+        result = {}
+        for theme, hits in zip(self.themes, counts):
+            result[f'theme_{theme}'] = int(hits > 0)
+        for theme, hits in zip(self.themes, counts):
+            result[f'theme_{theme}_hits'] = hits
+        return result
+
+
+class PhraseThemeMatcher(ThemeMatcher):
+    def __init__(self, theme_keywords):
+        """
+        Compile theme words and multi-word phrases into an Aho-Corasick automaton
+        The automaton runs over \\w+ tokens rather than characters, so phrases
+        like "break my heart" only match on word boundaries. Every keyword of
+        every theme is found in one linear pass over the lyrics, independent
+        of how many keywords the lexicon holds.
+        Args:
+            theme_keywords: dict mapping theme name -> list of words/phrases
+        """
+        self.themes = list(theme_keywords)
+        # Trie: per-node token -> child transitions, plus theme ids of the
+        # keywords ending at each node
+        self.goto = [{}]
+        self.output = [[]]
+        for theme_id, theme in enumerate(self.themes):
+            for keyword in dict.fromkeys(normalize_keyword(kw) for kw in theme_keywords[theme]):
+                if not keyword:
+                    continue
+                node = 0
+                for token in keyword.split(' '):
+                    child = self.goto[node].get(token)
+                    if child is None:
+                        child = self.goto[node][token] = len(self.goto)
+                        self.goto.append({})
+                        self.output.append([])
+                    node = child
+                self.output[node].append(theme_id)
+        
+        # Failure links (breadth-first), merging outputs of suffix keywords so
+        # "heart" is still counted inside "break my heart"
+        self.fail = [0] * len(self.goto)
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for token, child in self.goto[node].items():
+                fallback = self.fail[node]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(token, 0)
+                self.output[child] += self.output[self.fail[child]]
+                queue.append(child)
+        # Tuples are cheaper to iterate in the hot loop
+        self.output = [tuple(ids) for ids in self.output]
+
+    def count(self, text):
+        """Return per-theme word/phrase hit counts (in theme order) from one automaton pass"""
+        counts = [0] * len(self.themes)
+        if not isinstance(text, str):
+            return counts
+        goto, fail, output = self.goto, self.fail, self.output
+        node = 0
+        for token in word_tokens(text):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            for theme_id in output[node]:
+                counts[theme_id] += 1
+        return counts
+
+
+class SparseThemeScorer:
+    def __init__(self, theme_keywords, keyword_weights=None):
+        """
+        Score whole batches of lyrics against all themes with sparse matmuls
+        Args:
+            theme_keywords: dict mapping theme name -> list of keywords, or
+                dict keyword -> weight (see load_theme_lexicon)
+            keyword_weights: optional dict keyword -> weight for themes given
+                as lists (default 1.0)
+        """
+        from scipy import sparse
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        self.themes = list(theme_keywords)
+        self.vocabulary = {}
+        rows, cols, weights = [], [], []
+        keyword_weights = keyword_weights or {}
+        for theme_id, theme in enumerate(self.themes):
+            keywords = theme_keywords[theme]
+            theme_weights = {}
+            for keyword in keywords:
+                weight = keywords[keyword] if isinstance(keywords, dict) else None
+                theme_weights.setdefault(normalize_keyword(keyword), weight)
+            for keyword, weight in theme_weights.items():
+                if not keyword:
+                    continue
+                term_id = self.vocabulary.setdefault(keyword, len(self.vocabulary))
+                rows.append(term_id)
+                cols.append(theme_id)
+                weights.append(float(keyword_weights.get(keyword, 1.0) if weight is None else weight))
+
+        # Same tokens as ThemeMatcher (shared word_tokens); phrases are
+        # matched as space-joined n-grams up to the longest keyword
+        max_n = max((keyword.count(' ') + 1 for keyword in self.vocabulary), default=1)
+        self.vectorizer = CountVectorizer(
+            vocabulary=self.vocabulary, tokenizer=word_tokens, token_pattern=None,
+            lowercase=False, ngram_range=(1, max_n)
+        )
+        # keyword x theme weight matrix, plus its 0/1 pattern for raw hit counts
+        self.keyword_theme = sparse.csr_matrix(
+            (weights, (rows, cols)), shape=(len(self.vocabulary), len(self.themes))
+        )
+        self.keyword_theme_binary = sparse.csr_matrix(
+            ([1] * len(rows), (rows, cols)), shape=self.keyword_theme.shape, dtype='int64'
+        )
+
+    def document_term_matrix(self, texts):
+        """Build the sparse (n_texts x n_keywords) count matrix in one pass"""
+        texts = [text if isinstance(text, str) else '' for text in texts]
+        return self.vectorizer.transform(texts)
+
+    def score(self, texts):
+        """Return a dense (n_texts x n_themes) array of weighted theme scores"""
+        return (self.document_term_matrix(texts) @ self.keyword_theme).toarray()
+
+    def match(self, texts, threshold=0.0):
+        """
+        Score a batch of lyrics against every theme
+        Returns:
+            (flags, hits, scores) arrays of shape (n_texts, n_themes): 0/1 flags
+            where score > threshold, raw keyword hit counts, weighted scores
+        """
+        dtm = self.document_term_matrix(texts)
+        hits = (dtm @ self.keyword_theme_binary).toarray()
+        scores = (dtm @ self.keyword_theme).toarray()
+        return (scores > threshold).astype('uint8'), hits, scores
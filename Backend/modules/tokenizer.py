@@ -0,0 +1,116 @@
+import re
+import sys
+
+# Characters that always form their own token, as in NLTK's word tokenizer
+_ALWAYS_SPLIT = r";@#$%&?!*()\[\]{}<>«»“”‘’„‒-―"
+# Clitics are only split off before whitespace or punctuation NLTK pads with spaces
+_END = rf"(?=[\s{_ALWAYS_SPLIT}\",:.`]|'(?!\w)|$)"
+_CLITIC = rf"'(?:s|m|d|ll|re|ve){_END}"
+_NOT = rf"n't{_END}"
+# One character of a word: not whitespace/split punctuation/quotes/dashes/commas/
+# colons/periods, except a comma or colon before a digit ("1,000", "10:30"), an
+# inner period ("3.88"), a single hyphen and a non-clitic inner apostrophe
+_WORD_CHAR = (
+    rf"(?!{_NOT})"
+    rf"(?:[^\s{_ALWAYS_SPLIT}\"`,:.'-]|[,:](?=\d)|\.(?=[^\s.\]\)}}>\"'»”’])|-(?!-)"
+    rf"|(?<=\w)'(?!(?:s|m|d|ll|re|ve){_END})(?=\w))"
+)
+
+# Single-pass approximation of nltk.word_tokenize on lowercased text:
+# MacIntyre contractions, clitics and n't, quotes as `` / '', runs of periods,
+# double dashes, words, then single split punctuation.
+# Known differences: punkt keeps the period of learned abbreviations ("mr."),
+# which this splits like any other sentence-final period.
+TREEBANK_PATTERN = re.compile(
+    rf"""
+      \b(?:can(?=not\b)|d(?='ye\b)|gim(?=me\b)|gon(?=na\b)|got(?=ta\b)|lem(?=me\b)|more(?='n\b)|wan(?=na\s))
+    | '(?:t(?=is\b|was\b)|ye\b)
+    | {_CLITIC} | {_NOT}
+    | '(?:re|ve|ll|m|t|s|d|n)\b
+    | (?:[^\W\d_]\.){{2,}}
+    | ``|''|`+|\.{{2,}}|--
+    | (?:{_WORD_CHAR})+
+    | [{_ALWAYS_SPLIT},:.'-]
+    """,
+    re.VERBOSE
+)
+# Opening double quotes (start of text or after a space/bracket) become ``
+OPEN_QUOTE = re.compile(r"""(?:^|(?<=[\s(\[{<]))(?:"|'')""")
+
+# Lowercased \w+ runs (theme keyword matching)
+WORD_PATTERN = re.compile(r'\w+')
+
+# Lyric cleaning: bracketed section headers, then anything but letters/apostrophes/spaces
+BRACKETED = re.compile(r'\[.*?\]')
+NON_LETTER = re.compile(r"[^a-zA-Z' ]")
+
+
+def tokenize(text, lowercase=True, intern=False):
+    """
+    Fast replacement for nltk.word_tokenize (Treebank-style tokens)
+    Args:
+        text: string to tokenize (non-strings give [])
+        lowercase: lowercase before tokenizing
+        intern: sys.intern every token, so repeated tokens across a large
+            corpus share one string object
+    """
+    if not isinstance(text, str):
+        return []
+    if lowercase:
+        text = text.lower()
+    if '"' in text or "''" in text:
+        text = OPEN_QUOTE.sub(' `` ', text).replace('"', " '' ")
+    tokens = TREEBANK_PATTERN.findall(text)
+    return list(map(sys.intern, tokens)) if intern else tokens
+
+
+def word_tokens(text, intern=False):
+    """Lowercased \\w+ runs"""
+    if not isinstance(text, str):
+        return []
+    tokens = WORD_PATTERN.findall(text.lower())
+    return list(map(sys.intern, tokens)) if intern else tokens
+
+
+def alpha_words(text, intern=False):
+    """Lowercased whitespace-separated words that are purely alphabetic"""
+    if not isinstance(text, str):
+        return []
+    tokens = [word.lower() for word in text.split() if word.isalpha()]
+    return list(map(sys.intern, tokens)) if intern else tokens
+
+
+def count_words(text):
+    """Number of whitespace-separated words"""
+    return len(text.split()) if isinstance(text, str) else 0
+
+
+TOKENIZERS = {
+    'treebank': tokenize,
+    'word': word_tokens,
+    'alpha': alpha_words,
+}
+
+
+def tokenize_batch(texts, kind='treebank', intern=False):
+    """
+    Tokenize many texts with one of the shared tokenizers
+    Args:
+        texts: iterable of strings (non-strings give [])
+        kind: 'treebank' (word_tokenize-style), 'word' (\\w+ runs) or
+            'alpha' (alphabetic whitespace words)
+        intern: intern tokens (see tokenize)
+    Returns:
+        list of token lists
+    """
+    if kind not in TOKENIZERS:
+        raise ValueError(f"kind must be one of {tuple(TOKENIZERS)}")
+    tokenizer = TOKENIZERS[kind]
+    return [tokenizer(text, intern=intern) for text in texts]
+
+
+def clean_text(text):
+    """Drop [bracketed] sections and every character but letters, apostrophes and spaces"""
+    if not text:
+        return ""
+    return NON_LETTER.sub('', BRACKETED.sub('', text)).strip()
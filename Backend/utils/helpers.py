@@ -1,5 +1,5 @@
 import numpy as np
-import re
+from modules.tokenizer import clean_text
 
 def format_features(feature_dict, required_features):
     """
@@ -20,14 +20,9 @@ def normalize_tempo(tempo):
 
 def clean_lyrics(text):
     """Basic lyric cleaning function"""
-    if not text:
-        return ""
-    
-    # Remove content in brackets (like [Verse 1])
-    text = re.sub(r'\[.*?\]', '', text)
-    # Remove special characters but keep apostrophes
-    text = re.sub(r"[^a-zA-Z' ]", '', text)
-    return text.strip()
+    # Removes content in brackets (like [Verse 1]), then special characters
+    # except apostrophes, with the shared precompiled patterns
+    return clean_text(text)
 
 def log_transform(value, offset=1):
     """Apply log transformation to skewed features"""